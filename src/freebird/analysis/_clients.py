@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+import functools
+
+from freebird.config import ANTHROPIC_API_KEY
+
+
+@functools.lru_cache(maxsize=1)
+def get_async_anthropic():
+    """Process-wide async Anthropic client for calls made from the event loop."""
+    import anthropic
+
+    return anthropic.AsyncAnthropic(api_key=ANTHROPIC_API_KEY, max_retries=3, timeout=60)
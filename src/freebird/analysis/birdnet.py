@@ -1,10 +1,15 @@
 from __future__ import annotations
 
+import functools
 import logging
 from dataclasses import dataclass
 from pathlib import Path
 
-from freebird.config import BIRDNET_CONFIDENCE_THRESHOLD
+from freebird.config import (
+    BIRDNET_BACKEND,
+    BIRDNET_CONFIDENCE_THRESHOLD,
+    BIRDNET_PROCESSES,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -16,50 +21,76 @@ class BirdDetection:
     confidence: float
 
 
+@functools.lru_cache(maxsize=None)
+def _split_species_name(species_name: str) -> tuple[str, str]:
+    """Split a BirdNET label ("Scientific name_Common Name") into (latin, common)."""
+    parts = species_name.split("_", 1)
+    if len(parts) == 2:
+        return parts[0], parts[1]
+    return species_name, species_name
+
+
 class BirdAnalyzer:
-    def __init__(self) -> None:
+    def __init__(self, processes: int = BIRDNET_PROCESSES) -> None:
         logger.info("Loading BirdNET model...")
         import birdnet
-        self._model = birdnet.load("acoustic", "2.4", "tf")
-        logger.info("BirdNET model loaded")
+        self._model = birdnet.load("acoustic", "2.4", BIRDNET_BACKEND)
+        self._processes = processes
+        logger.info("BirdNET model loaded (%s backend, %d inference processes)",
+                    BIRDNET_BACKEND, processes)
 
     def analyze(self, audio_path: Path) -> BirdDetection | None:
-        if not audio_path.exists():
-            logger.warning("Audio file not found: %s", audio_path)
-            return None
+        return self.analyze_many([audio_path])[0]
+
+    def analyze_many(self, audio_paths: list[Path]) -> list[BirdDetection | None]:
+        """Run a single BirdNET prediction over all clips.
+
+        Returns one detection (or None) per input path, in the same order.
+        """
+        present = []
+        for path in audio_paths:
+            if path.exists():
+                present.append(path)
+            else:
+                logger.warning("Audio file not found: %s", path)
+        if not present:
+            return [None] * len(audio_paths)
 
         try:
-            predictions = self._model.predict(str(audio_path))
+            predictions = self._model.predict(
+                [str(p) for p in present], n_workers=self._processes,
+            )
         except Exception:
-            logger.exception("BirdNET prediction failed for %s", audio_path)
-            return None
+            logger.exception("BirdNET prediction failed for %d file(s)", len(present))
+            return [None] * len(audio_paths)
 
-        # Find the highest-confidence bird detection
-        best: BirdDetection | None = None
-        for row in predictions.to_structured_array():
-            confidence = float(row["confidence"])
-            species_name = str(row["species_name"])
+        # Drop sub-threshold rows and sort by confidence in numpy, so the Python
+        # loop only sees candidates and the first row per input file is its best
+        rows = predictions.to_structured_array()
+        rows = rows[rows["confidence"] >= BIRDNET_CONFIDENCE_THRESHOLD]
+        rows = rows[rows["confidence"].argsort()[::-1]]
 
-            if confidence < BIRDNET_CONFIDENCE_THRESHOLD:
+        best: dict[Path, BirdDetection] = {}
+        for row in rows:
+            key = Path(str(row["input"])).resolve()
+            if key in best:
                 continue
 
-            # species_name format: "Scientific name_Common Name"
-            parts = species_name.split("_", 1)
-            if len(parts) == 2:
-                latin, common = parts
-            else:
-                latin, common = species_name, species_name
-
-            if best is None or confidence > best.confidence:
-                best = BirdDetection(
-                    species=common,
-                    species_latin=latin,
-                    confidence=confidence,
-                )
+            latin, common = _split_species_name(str(row["species_name"]))
+            best[key] = BirdDetection(
+                species=common,
+                species_latin=latin,
+                confidence=float(row["confidence"]),
+            )
 
-        if best:
-            logger.info("Detected: %s (%.0f%%)", best.species, best.confidence * 100)
-        else:
-            logger.info("No confident bird detection in %s", audio_path.name)
+        results: list[BirdDetection | None] = []
+        for path in audio_paths:
+            detection = best.get(path.resolve())
+            if detection:
+                logger.info("Detected in %s: %s (%.0f%%)", path.name,
+                            detection.species, detection.confidence * 100)
+            elif path in present:
+                logger.info("No confident bird detection in %s", path.name)
+            results.append(detection)
+        return results
 
-        return best
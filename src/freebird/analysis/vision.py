@@ -1,19 +1,39 @@
 from __future__ import annotations
 
+import base64
+import functools
+import json
 import logging
 from dataclasses import dataclass
 from pathlib import Path
 
 from pydantic import BaseModel
+from pydantic_ai import Agent, BinaryContent
 
+from freebird.analysis._clients import get_async_anthropic
 from freebird.config import FEEDER_LOCATION, VISION_MODEL, VISION_PROMPT
+from freebird.media.downloader import downscale_jpeg
 from freebird.storage.database import Database
 
 logger = logging.getLogger(__name__)
 
 PROMPTS_DIR = Path(__file__).resolve().parents[3] / "eval" / "prompts"
 
+ANTHROPIC_PREFIX = "anthropic:"
+BATCH_MAX_TOKENS = 1024
+# Batch requests force this tool so replies arrive as schema-shaped tool input
+BATCH_TOOL_NAME = "record_sighting"
+# Message Batches accept at most 100,000 requests / 256 MB each; stay under both
+BATCH_MAX_REQUESTS = 10_000
+BATCH_MAX_BYTES = 200_000_000
 
+# Longest useful image edge for Claude; larger images only add upload time and tokens
+VISION_MAX_EDGE = 1568
+# Keyshots under this size are sent as-is (re-encoding costs an ffmpeg spawn)
+VISION_REENCODE_BYTES = 1_000_000
+
+
+@functools.lru_cache(maxsize=8)
 def load_prompt(name: str = "default") -> str:
     """Load a named prompt template from eval/prompts/{name}.txt."""
     text = (PROMPTS_DIR / f"{name}.txt").read_text()
@@ -54,8 +74,6 @@ class VisionResult:
 
 def _build_agent(model: str | None = None, prompt_name: str | None = None):
     """Create a PydanticAI Agent for vision analysis."""
-    from pydantic_ai import Agent
-
     return Agent(
         model or VISION_MODEL,
         output_type=VisionAnalysis,
@@ -74,67 +92,225 @@ def _get_agent():
     return _agent
 
 
+def _to_result(analysis: VisionAnalysis, raw: str) -> VisionResult:
+    return VisionResult(
+        is_bird=analysis.is_bird,
+        animal_type=analysis.animal_type,
+        species=analysis.species,
+        species_latin=analysis.species_latin,
+        confidence=analysis.confidence,
+        count=analysis.count,
+        sex=analysis.sex,
+        age=analysis.age,
+        behavior=analysis.behavior,
+        notable=analysis.notable,
+        raw_response=raw,
+    )
+
+
+def _record_analysis(
+    analysis: VisionAnalysis, sighting_id: str, db: Database, model: str,
+) -> VisionResult:
+    """Store a successful analysis in vision_analyses and log a one-line summary."""
+    raw = analysis.model_dump_json()
+    result = _to_result(analysis, raw)
+
+    db.insert_vision_analysis(
+        sighting_id=sighting_id,
+        is_bird=result.is_bird,
+        species=result.species,
+        species_latin=result.species_latin,
+        confidence=result.confidence,
+        animal_type=result.animal_type,
+        count=result.count,
+        sex=result.sex,
+        age=result.age,
+        behavior=result.behavior,
+        notable=result.notable,
+        raw_response=raw,
+        model=model,
+    )
+
+    if result.is_bird and result.species:
+        logger.info("Vision: %s (%s, %s)", result.species, result.confidence, result.behavior)
+    elif result.animal_type:
+        logger.info("Vision: %s detected (%s)", result.animal_type, result.behavior)
+    else:
+        logger.info("Vision: no animal detected")
+
+    return result
+
+
+def _record_failure(sighting_id: str, db: Database, model: str, error: str) -> None:
+    db.insert_vision_analysis(
+        sighting_id=sighting_id, is_bird=False, species=None,
+        species_latin=None, confidence=None, animal_type=None,
+        count=None, sex=None, age=None, behavior=None, notable=None,
+        raw_response="", model=model, error=error,
+    )
+
+
+async def _prepare_vision_jpeg(image_bytes: bytes) -> bytes:
+    """Shrink oversized keyshots before upload; small or unreadable ones pass through."""
+    if len(image_bytes) <= VISION_REENCODE_BYTES:
+        return image_bytes
+    smaller = await downscale_jpeg(image_bytes, VISION_MAX_EDGE)
+    if smaller is None or len(smaller) >= len(image_bytes):
+        return image_bytes
+    logger.info("Re-encoded keyshot %.0f KB -> %.0f KB",
+                len(image_bytes) / 1024, len(smaller) / 1024)
+    return smaller
+
+
 async def analyze_image(image_path: Path, sighting_id: str, db: Database) -> VisionResult | None:
-    if not image_path.exists():
+    # Read once up front; agent retries reuse the same buffer
+    try:
+        image_bytes = image_path.read_bytes()
+    except FileNotFoundError:
         logger.warning("Image not found: %s", image_path)
         return None
+    image_bytes = await _prepare_vision_jpeg(image_bytes)
 
     try:
-        from pydantic_ai import BinaryContent
-
         agent = _get_agent()
         ai_result = await agent.run([
             "Analyze this bird feeder camera image.",
-            BinaryContent(data=image_path.read_bytes(), media_type="image/jpeg"),
+            BinaryContent(data=image_bytes, media_type="image/jpeg"),
         ])
-        analysis = ai_result.output
-        raw = analysis.model_dump_json()
-
-        result = VisionResult(
-            is_bird=analysis.is_bird,
-            animal_type=analysis.animal_type,
-            species=analysis.species,
-            species_latin=analysis.species_latin,
-            confidence=analysis.confidence,
-            count=analysis.count,
-            sex=analysis.sex,
-            age=analysis.age,
-            behavior=analysis.behavior,
-            notable=analysis.notable,
-            raw_response=raw,
-        )
-
-        db.insert_vision_analysis(
-            sighting_id=sighting_id,
-            is_bird=result.is_bird,
-            species=result.species,
-            species_latin=result.species_latin,
-            confidence=result.confidence,
-            animal_type=result.animal_type,
-            count=result.count,
-            sex=result.sex,
-            age=result.age,
-            behavior=result.behavior,
-            notable=result.notable,
-            raw_response=raw,
-            model=VISION_MODEL,
-        )
-
-        if result.is_bird and result.species:
-            logger.info("Vision: %s (%s, %s)", result.species, result.confidence, result.behavior)
-        elif result.animal_type:
-            logger.info("Vision: %s detected (%s)", result.animal_type, result.behavior)
-        else:
-            logger.info("Vision: no animal detected")
-
-        return result
+        return _record_analysis(ai_result.output, sighting_id, db, VISION_MODEL)
 
     except Exception as e:
         logger.exception("Vision analysis failed")
-        db.insert_vision_analysis(
-            sighting_id=sighting_id, is_bird=False, species=None,
-            species_latin=None, confidence=None, animal_type=None,
-            count=None, sex=None, age=None, behavior=None, notable=None,
-            raw_response="", model=VISION_MODEL, error=str(e),
-        )
+        _record_failure(sighting_id, db, VISION_MODEL, str(e))
         return None
+
+
+# -- Anthropic Message Batches (bulk backfill at half the per-image cost) --
+
+
+def _anthropic_model(model: str) -> str:
+    if not model.startswith(ANTHROPIC_PREFIX):
+        raise ValueError(f"Message Batches need an {ANTHROPIC_PREFIX} model, got {model!r}")
+    return model[len(ANTHROPIC_PREFIX):]
+
+
+@functools.lru_cache(maxsize=1)
+def _batch_tool() -> dict:
+    return {
+        "name": BATCH_TOOL_NAME,
+        "description": "Record the analysis of a bird feeder camera image.",
+        "input_schema": VisionAnalysis.model_json_schema(),
+    }
+
+
+async def submit_vision_batches(image_paths: list[Path], sighting_ids: list[str]) -> list[str]:
+    """Submit Message Batches covering every image; returns the batch ids.
+
+    Images are split across as many batches as needed to stay under
+    BATCH_MAX_REQUESTS and BATCH_MAX_BYTES per batch. Each request is keyed by
+    ``custom_id=sighting_id`` so results can be matched back regardless of batch
+    or completion order. Missing images are skipped.
+    """
+    model = _anthropic_model(VISION_MODEL)
+    system = load_prompt(VISION_PROMPT)
+    tool = _batch_tool()
+    batch_ids: list[str] = []
+    requests: list[dict] = []
+    size = 0
+    for image_path, sighting_id in zip(image_paths, sighting_ids):
+        try:
+            image_bytes = image_path.read_bytes()
+        except FileNotFoundError:
+            logger.warning("Image not found: %s", image_path)
+            continue
+        image_bytes = await _prepare_vision_jpeg(image_bytes)
+        image_data = base64.standard_b64encode(image_bytes).decode("ascii")
+        request = {
+            "custom_id": sighting_id,
+            "params": {
+                "model": model,
+                "max_tokens": BATCH_MAX_TOKENS,
+                "system": system,
+                "tools": [tool],
+                "tool_choice": {"type": "tool", "name": BATCH_TOOL_NAME},
+                "messages": [{
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "image",
+                            "source": {
+                                "type": "base64",
+                                "media_type": "image/jpeg",
+                                "data": image_data,
+                            },
+                        },
+                        {"type": "text", "text": "Analyze this bird feeder camera image."},
+                    ],
+                }],
+            },
+        }
+        request_size = len(json.dumps(request))
+        if requests and (
+            len(requests) >= BATCH_MAX_REQUESTS or size + request_size > BATCH_MAX_BYTES
+        ):
+            batch_ids.append(await _create_batch(requests))
+            requests, size = [], 0
+        requests.append(request)
+        size += request_size
+
+    if requests:
+        batch_ids.append(await _create_batch(requests))
+    return batch_ids
+
+
+async def _create_batch(requests: list[dict]) -> str:
+    batch = await get_async_anthropic().messages.batches.create(requests=requests)
+    logger.info("Submitted vision batch %s (%d images)", batch.id, len(requests))
+    return batch.id
+
+
+async def vision_batch_ended(batch_id: str) -> bool:
+    batch = await get_async_anthropic().messages.batches.retrieve(batch_id)
+    counts = batch.request_counts
+    logger.info(
+        "Batch %s: %s (%d processing, %d succeeded, %d errored)",
+        batch_id, batch.processing_status,
+        counts.processing, counts.succeeded, counts.errored,
+    )
+    return batch.processing_status == "ended"
+
+
+async def fetch_vision_batch(batch_id: str) -> list:
+    """Download every result item of an ended batch (no DB writes)."""
+    return [item async for item in await get_async_anthropic().messages.batches.results(batch_id)]
+
+
+def store_vision_batch(items: list, db: Database) -> dict[str, VisionResult | None]:
+    """Store fetched batch results, keyed by sighting id.
+
+    Items that errored, expired, or returned invalid tool input are recorded
+    as failed analyses and map to ``None``; the rest of the batch is unaffected.
+    """
+    results: dict[str, VisionResult | None] = {}
+    for item in items:
+        sighting_id = item.custom_id
+        outcome = item.result
+        if outcome.type != "succeeded":
+            error = getattr(getattr(outcome, "error", None), "error", None)
+            message = getattr(error, "message", None) or outcome.type
+            logger.warning("Batch item %s %s: %s", sighting_id, outcome.type, message)
+            _record_failure(sighting_id, db, VISION_MODEL, message)
+            results[sighting_id] = None
+            continue
+        try:
+            tool_input = next(
+                b.input for b in outcome.message.content if b.type == "tool_use"
+            )
+            results[sighting_id] = _record_analysis(
+                VisionAnalysis.model_validate(tool_input), sighting_id, db, VISION_MODEL,
+            )
+        except Exception as e:
+            logger.exception("Invalid batch result for %s", sighting_id)
+            _record_failure(sighting_id, db, VISION_MODEL, str(e))
+            results[sighting_id] = None
+    return results
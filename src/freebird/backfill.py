@@ -1,16 +1,25 @@
-"""One-time backfill: load up to 3 days of VicoHome history into the sightings table."""
+"""One-time backfill: load up to 3 days of VicoHome history into the sightings table.
+
+Vision only runs on events BirdNET couldn't confidently identify; pass
+--force-vision to analyze every keyshot.
+"""
 from __future__ import annotations
 
 import asyncio
 import logging
+import sys
 import time
+from dataclasses import dataclass
+from pathlib import Path
 
-from freebird.analysis.birdnet import BirdAnalyzer
+from freebird.analysis.birdnet import BirdAnalyzer, BirdDetection
+from freebird.analysis.vision import analyze_image
 from freebird.config import ensure_dirs
 from freebird.media.downloader import download_image, download_video, extract_audio
 from freebird.storage.database import Database
 from freebird.vicohome.api import VicoHomeAPI
 from freebird.vicohome.auth import AuthManager
+from freebird.vicohome.models import MotionEvent
 
 logging.basicConfig(
     level=logging.INFO,
@@ -20,7 +29,93 @@ logging.basicConfig(
 logger = logging.getLogger("freebird.backfill")
 
 
-async def backfill() -> None:
+# Events downloaded concurrently; each one is mostly network + ffmpeg wait
+BACKFILL_CONCURRENCY = 8
+
+# BirdNET hits at or above this confidence skip the (slow, paid) vision call
+VISION_SKIP_CONFIDENCE = 0.75
+
+
+@dataclass
+class _Pending:
+    event: MotionEvent
+    image_path: Path | None
+    video_path: Path | None
+    audio_path: Path | None
+    sighting_id: str | None = None
+
+
+async def _download_event(event: MotionEvent, sem: asyncio.Semaphore) -> _Pending:
+    """Fetch keyshot, video, and audio for one event (no DB writes)."""
+    async with sem:
+        # Keyshot and video come from the same CDN; fetch them side by side
+        image_path, video_path = await asyncio.gather(
+            asyncio.to_thread(download_image, event.keyshot_url, event.trace_id),
+            download_video(event.video_url, event.trace_id),
+        )
+
+        audio_path = None
+        if video_path:
+            audio_path = await extract_audio(video_path, event.trace_id)
+
+        return _Pending(event, image_path, video_path, audio_path)
+
+
+async def _record_species(
+    db: Database,
+    pending: _Pending,
+    detection: BirdDetection | None,
+    force_vision: bool,
+) -> bool:
+    """Resolve and store the species for one sighting. Returns True if vision ran."""
+    event = pending.event
+    species = None
+    species_latin = None
+    confidence = None
+    is_lifer = False
+
+    if detection:
+        species = detection.species
+        species_latin = detection.species_latin
+        confidence = detection.confidence
+
+    ran_vision = False
+    if pending.image_path and (force_vision or confidence is None
+                               or confidence < VISION_SKIP_CONFIDENCE):
+        ran_vision = True
+        vision = await analyze_image(pending.image_path, pending.sighting_id, db)
+        if vision and vision.is_bird and vision.species:
+            species = vision.species
+            species_latin = vision.species_latin
+            confidence_map = {"high": 0.9, "medium": 0.7, "low": 0.4}
+            confidence = confidence_map.get(vision.confidence or "", 0.5)
+
+    # Fallback to VicoHome's own bird ID
+    if not species and event.bird_name:
+        species = event.bird_name
+        species_latin = event.bird_latin
+        confidence = event.bird_confidence
+
+    if species:
+        is_lifer = db.is_lifer(species)
+
+    # Media paths are only kept when audio extraction succeeded
+    has_audio = pending.audio_path is not None
+    db.finalize_sighting(
+        pending.sighting_id, species, species_latin, confidence, is_lifer,
+        video_path=str(pending.video_path) if has_audio else None,
+        audio_path=str(pending.audio_path) if has_audio else None,
+    )
+
+    if species:
+        logger.info("%s -> %s (%.0f%%)%s", event.trace_id, species, (confidence or 0) * 100,
+                     " [LIFER]" if is_lifer else "")
+    else:
+        logger.info("%s -> No species identified", event.trace_id)
+    return ran_vision
+
+
+async def backfill(force_vision: bool = False) -> None:
     ensure_dirs()
 
     auth = AuthManager()
@@ -35,69 +130,48 @@ async def backfill() -> None:
     events = api.get_events(start_timestamp=start, end_timestamp=now)
     logger.info("Found %d total events", len(events))
 
-    new = 0
-    skipped = 0
-    for event in events:
-        if db.has_trace_id(event.trace_id):
-            skipped += 1
-            continue
-
-        new += 1
-        logger.info("[%d/%d] Processing %s (%s)", new, len(events) - skipped,
-                     event.trace_id, event.device_name)
-
-        # Download keyshot
-        image_path = download_image(event.keyshot_url, event.trace_id)
-
-        # Insert sighting
-        sighting_id = db.insert_sighting(
-            trace_id=event.trace_id,
-            timestamp=event.timestamp,
-            device_name=event.device_name,
-            image_path=str(image_path) if image_path else None,
+    existing = db.get_trace_ids(since=start)
+    new_events = [e for e in events if e.trace_id not in existing]
+    skipped = len(events) - len(new_events)
+    logger.info("Downloading %d new events (%d at a time)", len(new_events), BACKFILL_CONCURRENCY)
+
+    # Phase 1: download media concurrently, then insert every sighting in one transaction
+    sem = asyncio.Semaphore(BACKFILL_CONCURRENCY)
+    pending = await asyncio.gather(*(_download_event(e, sem) for e in new_events))
+    with db.transaction():
+        ids = db.insert_sightings_many([
+            (p.event.trace_id, p.event.timestamp, p.event.device_name,
+             str(p.image_path) if p.image_path else None)
+            for p in pending
+        ])
+    for p, sighting_id in zip(pending, ids):
+        p.sighting_id = sighting_id
+    # Drop events the live pipeline stored since the dedup check
+    pending = [p for p in pending if p.sighting_id is not None]
+
+    # Phase 2: BirdNET over every extracted clip
+    with_audio = [p for p in pending if p.audio_path]
+    logger.info("Running BirdNET on %d audio clips", len(with_audio))
+    detections: dict[str, BirdDetection | None] = {}
+    if with_audio:
+        # One prediction over every clip; birdnet spreads it over BIRDNET_PROCESSES
+        results = await asyncio.to_thread(
+            analyzer.analyze_many, [p.audio_path for p in with_audio]
         )
+        detections = {p.sighting_id: d for p, d in zip(with_audio, results)}
 
-        # Download video + extract audio + BirdNET
-        species = None
-        species_latin = None
-        confidence = None
-        is_lifer = False
-
-        video_path = await download_video(event.video_url, event.trace_id)
-        if video_path:
-            audio_path = await extract_audio(video_path, event.trace_id)
-            if audio_path:
-                detection = analyzer.analyze(audio_path)
-                if detection:
-                    species = detection.species
-                    species_latin = detection.species_latin
-                    confidence = detection.confidence
-                    is_lifer = db.is_lifer(species)
-
-                db.update_media_paths(
-                    sighting_id,
-                    video_path=str(video_path),
-                    audio_path=str(audio_path),
-                )
-
-        # Fallback to VicoHome's own bird ID
-        if not species and event.bird_name:
-            species = event.bird_name
-            species_latin = event.bird_latin
-            confidence = event.bird_confidence
-            is_lifer = db.is_lifer(species)
-
-        db.update_species(sighting_id, species, species_latin, confidence, is_lifer)
-
-        if species:
-            logger.info("  -> %s (%.0f%%)%s", species, (confidence or 0) * 100,
-                         " [LIFER]" if is_lifer else "")
-        else:
-            logger.info("  -> No species identified")
+    # Phase 3: record species oldest-first so lifer flags land on the first sighting
+    vision_runs = 0
+    for p in sorted(pending, key=lambda p: p.event.timestamp):
+        vision_runs += await _record_species(db, p, detections.get(p.sighting_id), force_vision)
+    with_image = sum(1 for p in pending if p.image_path)
 
     db.close()
-    logger.info("Backfill complete: %d new, %d already existed", new, skipped)
+    logger.info(
+        "Backfill complete: %d new, %d already existed, vision ran on %d (%d skipped on BirdNET)",
+        len(new_events), skipped, vision_runs, with_image - vision_runs,
+    )
 
 
 if __name__ == "__main__":
-    asyncio.run(backfill())
+    asyncio.run(backfill(force_vision="--force-vision" in sys.argv))
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import logging
 
+from freebird.analysis._clients import get_async_anthropic
 from freebird.config import ANTHROPIC_API_KEY
 from freebird.storage.database import Database
 
@@ -23,10 +24,7 @@ async def ask_claude(question: str, db: Database, user_name: str = "") -> str:
     context = db.get_recent_summary(days=7)
 
     try:
-        import anthropic
-
-        client = anthropic.Anthropic(api_key=ANTHROPIC_API_KEY)
-        message = client.messages.create(
+        message = await get_async_anthropic().messages.create(
             model=MODEL,
             max_tokens=500,
             system=SYSTEM_PROMPT,
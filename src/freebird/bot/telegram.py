@@ -1,11 +1,18 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
+from collections import Counter, defaultdict
+from collections.abc import Awaitable, Callable
+from datetime import timedelta
 from pathlib import Path
+from typing import TypeVar
 
 from freebird.config import format_local_time, local_today
 
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
+from telegram.error import RetryAfter
 from telegram.ext import (
     Application,
     CallbackQueryHandler,
@@ -16,32 +23,126 @@ from telegram.ext import (
 )
 
 from freebird.bot.claude import ask_claude
-from freebird.config import TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID
-from freebird.storage.database import Database
+from freebird.config import TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID, TELEGRAM_CHAT_ID_INT
+from freebird.ratelimit import AsyncLimiter
+from freebird.storage.database import Database, Sighting
 
 logger = logging.getLogger(__name__)
 
+# Species search results are reused for this long unless new species data arrives
+SPECIES_CACHE_TTL = 60
+SPECIES_CACHE_SIZE = 256
+
+# Telegram Bot API limits: ~30 messages/s overall, 20 messages/min into one group
+GLOBAL_SEND_RATE = 30
+CHAT_SENDS_PER_MINUTE = 20
+BUTTONS_PER_ROW = 2
+
+START_TEXT = (
+    "Welcome to FreeBird!\n\n"
+    "/today -- Today's birds\n"
+    "/stats -- Summary statistics\n"
+    "/lifers -- All first-ever sightings\n"
+    "/species <name> -- Search by species\n"
+    "/show <name> -- Show photo/video of a species\n"
+    "/latest -- Latest video from today\n\n"
+    "Or just ask me anything about your birds!"
+)
+SPECIES_USAGE = "Usage: /species <name>\nExample: /species cardinal"
+SHOW_USAGE = "Usage: /show <name>\nExample: /show rock pigeon\nAlso works for critters: /show squirrel"
+
+T = TypeVar("T")
+
+
+def _conf(confidence: float | None) -> str:
+    """Format a confidence as " (87%)", or "" when unknown."""
+    return f" ({int(confidence * 100)}%)" if confidence else ""
+
+
+async def _read_media(path: Path | str | None) -> bytes | None:
+    """Read a media file in a worker thread so uploads never block the event loop."""
+    if not path:
+        return None
+    try:
+        return await asyncio.to_thread(Path(path).read_bytes)
+    except FileNotFoundError:
+        return None
+
 
 class TelegramBot:
     def __init__(self, db: Database) -> None:
         self.db = db
         self.app = Application.builder().token(TELEGRAM_BOT_TOKEN).build()
+        self._species_cache: dict[str, tuple[int, float, list[Sighting]]] = {}
+        self._bot_username: str = ""
+        self._global_limiter = AsyncLimiter(GLOBAL_SEND_RATE, 1)
+        self._chat_limiters: defaultdict[str, AsyncLimiter] = defaultdict(
+            lambda: AsyncLimiter(CHAT_SENDS_PER_MINUTE, 60)
+        )
         self._register_handlers()
 
+    async def initialize(self) -> None:
+        """Initialize the application and cache the bot's @username for mention checks."""
+        await self.app.initialize()
+        # initialize() already fetched get_me(); keep the result instead of asking per message
+        self._bot_username = self.app.bot.username
+
     def _register_handlers(self) -> None:
-        self.app.add_handler(CommandHandler("today", self._cmd_today))
-        self.app.add_handler(CommandHandler("stats", self._cmd_stats))
-        self.app.add_handler(CommandHandler("lifers", self._cmd_lifers))
-        self.app.add_handler(CommandHandler("species", self._cmd_species))
-        self.app.add_handler(CommandHandler("show", self._cmd_show))
-        self.app.add_handler(CommandHandler("latest", self._cmd_latest))
-        self.app.add_handler(CommandHandler("start", self._cmd_start))
-        self.app.add_handler(CommandHandler("help", self._cmd_start))
+        self._commands: dict[str, Callable[[Update, ContextTypes.DEFAULT_TYPE], Awaitable[None]]] = {
+            "today": self._cmd_today,
+            "stats": self._cmd_stats,
+            "lifers": self._cmd_lifers,
+            "species": self._cmd_species,
+            "show": self._cmd_show,
+            "latest": self._cmd_latest,
+            "start": self._cmd_start,
+            "help": self._cmd_start,
+        }
+        # One handler for every command; _dispatch_command picks the method by name
+        self.app.add_handler(CommandHandler(list(self._commands), self._dispatch_command))
         self.app.add_handler(CallbackQueryHandler(self._callback_species_detail))
         self.app.add_handler(
             MessageHandler(filters.TEXT & ~filters.COMMAND, self._handle_freeform)
         )
 
+    async def _dispatch_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        # "/show@FreeBirdBot rock pigeon" -> "show"
+        name = update.effective_message.text.split(maxsplit=1)[0][1:].partition("@")[0]
+        await self._commands[name.lower()](update, context)
+
+    def _search_species(self, query: str) -> list[Sighting]:
+        """db.search_species with a short-lived cache keyed by the normalized query."""
+        key = query.strip().lower()
+        now = time.monotonic()
+        cached = self._species_cache.pop(key, None)
+        if (cached and cached[0] == self.db.species_version
+                and now - cached[1] < SPECIES_CACHE_TTL):
+            results = cached[2]
+            now = cached[1]
+        else:
+            results = self.db.search_species(query)
+        # Re-insert so dict order tracks recency; evict the least recently used
+        self._species_cache[key] = (self.db.species_version, now, results)
+        if len(self._species_cache) > SPECIES_CACHE_SIZE:
+            del self._species_cache[next(iter(self._species_cache))]
+        return results
+
+    async def _throttled(self, chat_id: int | str, send: Callable[[], Awaitable[T]]) -> T:
+        """Run an outbound Bot API call within the global and per-chat send limits.
+
+        If Telegram still answers 429, wait the requested time and retry once.
+        """
+        async with self._global_limiter, self._chat_limiters[str(chat_id)]:
+            try:
+                return await send()
+            except RetryAfter as e:
+                delay = e.retry_after
+                if isinstance(delay, timedelta):
+                    delay = delay.total_seconds()
+                logger.warning("Telegram flood control, retrying in %ss", delay)
+                await asyncio.sleep(delay)
+                return await send()
+
     # -- Notification methods (called by pipeline / scheduler) --
 
     async def send_lifer_alert(
@@ -55,82 +156,71 @@ class TelegramBot:
         pct = int(confidence * 100) if confidence else 0
         caption = f"NEW LIFER: {species}! ({pct}% confidence)"
         try:
-            if image_path and image_path.exists():
-                await self.app.bot.send_photo(
+            image = await _read_media(image_path)
+            if image:
+                await self._throttled(TELEGRAM_CHAT_ID, lambda: self.app.bot.send_photo(
                     chat_id=TELEGRAM_CHAT_ID,
-                    photo=image_path.open("rb"),
+                    photo=image,
+                    filename=image_path.name,
                     caption=caption,
-                )
+                ))
             else:
-                await self.app.bot.send_message(
+                await self._throttled(TELEGRAM_CHAT_ID, lambda: self.app.bot.send_message(
                     chat_id=TELEGRAM_CHAT_ID,
                     text=caption,
-                )
-            if video_path and video_path.exists():
-                await self.app.bot.send_video(
+                ))
+            video = await _read_media(video_path)
+            if video:
+                await self._throttled(TELEGRAM_CHAT_ID, lambda: self.app.bot.send_video(
                     chat_id=TELEGRAM_CHAT_ID,
-                    video=video_path.open("rb"),
-                )
+                    video=video,
+                    filename=video_path.name,
+                ))
         except Exception:
             logger.exception("Failed to send lifer alert")
 
     async def send_daily_summary(self) -> None:
         """Send the 6pm daily summary: visits, unique species, per-species counts."""
-        sightings = self.db.get_today_sightings()
-        total_visits = len(sightings)
+        species_counts = self.db.get_today_species_counts()
+        total_visits = sum(count for _, count in species_counts)
 
         if total_visits == 0:
-            await self.app.bot.send_message(
+            await self._throttled(TELEGRAM_CHAT_ID, lambda: self.app.bot.send_message(
                 chat_id=TELEGRAM_CHAT_ID,
                 text="Daily summary: No bird sightings today.",
-            )
+            ))
             return
 
-        species_counts: dict[str, int] = {}
-        for s in sightings:
-            name = s.species or "Unknown"
-            species_counts[name] = species_counts.get(name, 0) + 1
-
         lines = [
             "Daily Summary:",
             f"  Total visits: {total_visits}",
             f"  Unique species: {len(species_counts)}",
             "",
             "Visits per species:",
+            *[f"  {name}: {count}" for name, count in species_counts],
         ]
-        for name, count in sorted(species_counts.items(), key=lambda x: -x[1]):
-            lines.append(f"  {name}: {count}")
 
         try:
-            await self.app.bot.send_message(
+            await self._throttled(TELEGRAM_CHAT_ID, lambda: self.app.bot.send_message(
                 chat_id=TELEGRAM_CHAT_ID,
                 text="\n".join(lines),
-            )
+            ))
         except Exception:
             logger.exception("Failed to send daily summary")
 
     async def send_error_alert(self, error_msg: str) -> None:
         try:
-            await self.app.bot.send_message(
+            await self._throttled(TELEGRAM_CHAT_ID, lambda: self.app.bot.send_message(
                 chat_id=TELEGRAM_CHAT_ID,
                 text=f"FreeBird error: {error_msg}",
-            )
+            ))
         except Exception:
             logger.exception("Failed to send error alert")
 
     # -- Bot command handlers --
 
     async def _cmd_start(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-        await update.message.reply_text(
-            "Welcome to FreeBird!\n\n"
-            "/today -- Today's birds\n"
-            "/stats -- Summary statistics\n"
-            "/lifers -- All first-ever sightings\n"
-            "/species <name> -- Search by species\n"
-            "/show <name> -- Show photo/video of a species\n"
-            "/latest -- Latest video from today\n\n"
-            "Or just ask me anything about your birds!"
-        )
+        await update.message.reply_text(START_TEXT)
 
     async def _cmd_today(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         sightings = self.db.get_today_sightings()
@@ -138,19 +228,21 @@ class TelegramBot:
             await update.message.reply_text("No bird sightings today yet!")
             return
 
-        # Group by species
-        species_counts: dict[str, int] = {}
-        for s in sightings:
-            name = s.species or "Unknown"
-            species_counts[name] = species_counts.get(name, 0) + 1
-
-        lines = ["Today's birds:"]
-        buttons = []
-        for name, count in sorted(species_counts.items(), key=lambda x: -x[1]):
-            lines.append(f"  {name}: {count} visit{'s' if count > 1 else ''}")
-            buttons.append(
-                [InlineKeyboardButton(f"{name} ({count})", callback_data=f"species:{name}")]
-            )
+        # Group by species, most visits first
+        species_counts = Counter(s.species or "Unknown" for s in sightings).most_common()
+
+        lines = ["Today's birds:", *[
+            f"  {name}: {count} visit{'s' if count > 1 else ''}"
+            for name, count in species_counts
+        ]]
+        species_buttons = [
+            InlineKeyboardButton(f"{name} ({count})", callback_data=f"species:{name}")
+            for name, count in species_counts
+        ]
+        buttons = [
+            species_buttons[i:i + BUTTONS_PER_ROW]
+            for i in range(0, len(species_buttons), BUTTONS_PER_ROW)
+        ]
 
         await update.message.reply_text(
             "\n".join(lines),
@@ -168,12 +260,10 @@ class TelegramBot:
         ]
         if stats["top_species"]:
             lines.append("\nTop visitors:")
-            for name, count in stats["top_species"]:
-                lines.append(f"  {name}: {count}")
+            lines.extend(f"  {name}: {count}" for name, count in stats["top_species"])
         if stats["critters"]:
             lines.append("\nOther critters:")
-            for name, count in stats["critters"]:
-                lines.append(f"  {name}: {count}")
+            lines.extend(f"  {name}: {count}" for name, count in stats["critters"])
         await update.message.reply_text("\n".join(lines))
 
     async def _cmd_lifers(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -181,28 +271,27 @@ class TelegramBot:
         if not lifers:
             await update.message.reply_text("No lifers recorded yet!")
             return
-        lines = ["First-ever sightings:"]
-        for s in lifers:
-            ts = format_local_time(s.timestamp, "%b %d")
-            conf = f" ({int(s.confidence * 100)}%)" if s.confidence else ""
-            lines.append(f"  {s.species}{conf} -- {ts}")
-        await update.message.reply_text("\n".join(lines))
+        body = "\n".join(
+            f"  {s.species}{_conf(s.confidence)} -- {format_local_time(s.timestamp, '%b %d')}"
+            for s in lifers
+        )
+        await update.message.reply_text(f"First-ever sightings:\n{body}")
 
     async def _cmd_species(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         args = context.args
         if not args:
-            await update.message.reply_text("Usage: /species <name>\nExample: /species cardinal")
+            await update.message.reply_text(SPECIES_USAGE)
             return
         query = " ".join(args)
-        results = self.db.search_species(query)
+        results = self._search_species(query)
         if not results:
             await update.message.reply_text(f'No sightings matching "{query}"')
             return
-        lines = [f'Sightings matching "{query}":']
-        for s in results[:10]:
-            ts = format_local_time(s.timestamp, "%b %d %I:%M %p")
-            conf = f" ({int(s.confidence * 100)}%)" if s.confidence else ""
-            lines.append(f"  {s.species}{conf} -- {ts}")
+        lines = [f'Sightings matching "{query}":', *(
+            f"  {s.species}{_conf(s.confidence)} -- "
+            f"{format_local_time(s.timestamp, '%b %d %I:%M %p')}"
+            for s in results[:10]
+        )]
         if len(results) > 10:
             lines.append(f"  ... and {len(results) - 10} more")
         await update.message.reply_text("\n".join(lines))
@@ -210,26 +299,21 @@ class TelegramBot:
     async def _cmd_show(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         args = context.args
         if not args:
-            await update.message.reply_text("Usage: /show <name>\nExample: /show rock pigeon\nAlso works for critters: /show squirrel")
+            await update.message.reply_text(SHOW_USAGE)
             return
         query = " ".join(args)
-        results = self.db.search_species(query)
-
-        if results:
-            sighting = results[0]
-            caption = f"{sighting.species or query}"
-            if sighting.confidence:
-                caption += f" ({int(sighting.confidence * 100)}%)"
-            caption += f"\n{format_local_time(sighting.timestamp, '%b %d %I:%M %p')}"
-            if sighting.device_name:
-                caption += f" - {sighting.device_name}"
-
-            vision = self.db.get_vision_for_sighting(sighting.id)
+        match = self.db.find_species_with_vision(query)
+
+        if match:
+            sighting, vision = match
+            device = f" - {sighting.device_name}" if sighting.device_name else ""
+            parts = [
+                f"{sighting.species or query}{_conf(sighting.confidence)}",
+                f"{format_local_time(sighting.timestamp, '%b %d %I:%M %p')}{device}",
+            ]
             if vision:
-                if vision["behavior"]:
-                    caption += f"\n{vision['behavior']}"
-                if vision["notable"]:
-                    caption += f"\n{vision['notable']}"
+                parts += (vision["behavior"], vision["notable"])
+            caption = "\n".join(filter(None, parts))
 
             image_path = sighting.image_path
             video_path = sighting.video_path
@@ -241,30 +325,29 @@ class TelegramBot:
                 return
 
             critter = critters[0]
-            caption = f"{critter['animal_type'] or query}"
-            caption += f"\n{format_local_time(critter['timestamp'], '%b %d %I:%M %p')}"
-            if critter["device_name"]:
-                caption += f" - {critter['device_name']}"
-            if critter["behavior"]:
-                caption += f"\n{critter['behavior']}"
-            if critter["notable"]:
-                caption += f"\n{critter['notable']}"
+            device = f" - {critter['device_name']}" if critter["device_name"] else ""
+            caption = "\n".join(filter(None, (
+                critter["animal_type"] or query,
+                f"{format_local_time(critter['timestamp'], '%b %d %I:%M %p')}{device}",
+                critter["behavior"],
+                critter["notable"],
+            )))
 
             image_path = critter["image_path"]
             video_path = critter["video_path"]
 
+        # Read both files concurrently; sends stay ordered so the captioned photo comes first
+        image, video = await asyncio.gather(_read_media(image_path), _read_media(video_path))
         sent_media = False
-        if image_path:
-            img = Path(image_path)
-            if img.exists():
-                await update.message.reply_photo(photo=img.open("rb"), caption=caption)
-                sent_media = True
-
-        if video_path:
-            vid = Path(video_path)
-            if vid.exists():
-                await update.message.reply_video(video=vid.open("rb"))
-                sent_media = True
+        if image:
+            await update.message.reply_photo(
+                photo=image, filename=Path(image_path).name, caption=caption
+            )
+            sent_media = True
+
+        if video:
+            await update.message.reply_video(video=video, filename=Path(video_path).name)
+            sent_media = True
 
         if not sent_media:
             await update.message.reply_text(f"No media available for {query}")
@@ -284,22 +367,22 @@ class TelegramBot:
             await update.message.reply_text("No videos from today yet!")
             return
 
-        vid = Path(row["video_path"])
-        if not vid.exists():
+        video, image = await asyncio.gather(
+            _read_media(row["video_path"]), _read_media(row["image_path"])
+        )
+        if not video:
             await update.message.reply_text("Video file not found on disk.")
             return
 
         species = row["species"] or row["v_species"] or row["animal_type"] or "Unknown"
         ts = format_local_time(row["timestamp"])
-        caption = f"{species} at {ts}"
-        if row["behavior"]:
-            caption += f"\n{row['behavior']}"
+        caption = "\n".join(filter(None, (f"{species} at {ts}", row["behavior"])))
 
-        if row["image_path"] and Path(row["image_path"]).exists():
+        if image:
             await update.message.reply_photo(
-                photo=Path(row["image_path"]).open("rb"), caption=caption
+                photo=image, filename=Path(row["image_path"]).name, caption=caption
             )
-        await update.message.reply_video(video=vid.open("rb"))
+        await update.message.reply_video(video=video, filename=Path(row["video_path"]).name)
 
     async def _callback_species_detail(
         self, update: Update, context: ContextTypes.DEFAULT_TYPE
@@ -310,31 +393,35 @@ class TelegramBot:
         if not data.startswith("species:"):
             return
         species_name = data[len("species:"):]
-        results = self.db.search_species(species_name)
-        if not results:
-            await query.edit_message_text(f"No details found for {species_name}")
+        chat_id = update.effective_chat.id
+        # Buttons carry the exact stored species name, so skip the substring search
+        summary = self.db.search_species_summary(species_name, exact=True)
+        if not summary:
+            await self._throttled(chat_id, lambda: query.edit_message_text(
+                f"No details found for {species_name}"
+            ))
             return
-        latest = results[0]
+        latest, total = summary
         lines = [
             f"{latest.species}",
             f"  Latin: {latest.species_latin or 'N/A'}",
             f"  Last seen: {format_local_time(latest.timestamp, '%b %d %I:%M %p')}",
-            f"  Total sightings: {len(results)}",
+            f"  Total sightings: {total}",
         ]
         if latest.confidence:
             lines.append(f"  Last confidence: {int(latest.confidence * 100)}%")
-        await query.edit_message_text("\n".join(lines))
+        await self._throttled(chat_id, lambda: query.edit_message_text("\n".join(lines)))
 
     async def _handle_freeform(
         self, update: Update, context: ContextTypes.DEFAULT_TYPE
     ) -> None:
         # Only respond to messages from the configured chat
-        if str(update.effective_chat.id) != TELEGRAM_CHAT_ID:
+        if update.effective_chat.id != TELEGRAM_CHAT_ID_INT:
             return
 
         # In group chats, only respond when the bot is mentioned
         text = update.message.text or ""
-        bot_username = (await self.app.bot.get_me()).username
+        bot_username = self._bot_username
         if update.effective_chat.type in ("group", "supergroup"):
             if f"@{bot_username}" not in text:
                 return
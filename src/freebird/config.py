@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 import os
 from datetime import datetime, timezone
 from pathlib import Path
@@ -19,6 +20,19 @@ VICOHOME_API_BASE: str | None = os.getenv("VICOHOME_API_BASE")
 TELEGRAM_BOT_TOKEN: str = os.environ["TELEGRAM_BOT_TOKEN"]
 TELEGRAM_CHAT_ID: str = os.environ["TELEGRAM_CHAT_ID"]
 
+
+def _parse_chat_id(value: str) -> int | None:
+    """Numeric form of a chat id; None for blank or @channel values."""
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+# For comparing against Update.effective_chat.id; None never matches an int id,
+# same as the str(chat.id) comparison did for non-numeric values
+TELEGRAM_CHAT_ID_INT: int | None = _parse_chat_id(TELEGRAM_CHAT_ID)
+
 # Claude
 ANTHROPIC_API_KEY: str = os.getenv("ANTHROPIC_API_KEY", "")
 
@@ -33,17 +47,25 @@ POLL_INTERVAL_SECONDS: int = int(os.getenv("POLL_INTERVAL_SECONDS", "15"))
 
 # BirdNET
 BIRDNET_CONFIDENCE_THRESHOLD: float = float(os.getenv("BIRDNET_CONFIDENCE_THRESHOLD", "0.5"))
+# "tf" = TFLite (CPU), "pb" = full TensorFlow graph (can run on a GPU)
+BIRDNET_BACKEND: str = os.getenv("BIRDNET_BACKEND", "tf")
+# Inference worker processes per BirdNET prediction; each loads its own model copy
+BIRDNET_PROCESSES: int = int(os.getenv("BIRDNET_PROCESSES", "2"))
 
 # Vision
 VISION_MODEL: str = os.getenv("VISION_MODEL", "google-gla:gemini-3-flash-preview")
 VISION_PROMPT: str = os.getenv("VISION_PROMPT", "default_v2")
 GOOGLE_API_KEY: str = os.getenv("GOOGLE_API_KEY", "")
+# Batch vision calls (backfill, eval) stay below the Gemini free tier's 10 RPM so
+# clock skew or a retry doesn't trip 429s
+VISION_RPM: int = 8
 
 # Feeder location and timezone
 FEEDER_LOCATION: str = os.getenv("FEEDER_LOCATION", "your city")
 TIMEZONE: ZoneInfo = ZoneInfo(os.getenv("TIMEZONE", "America/Toronto"))
 
 
+@functools.lru_cache(maxsize=4096)
 def format_local_time(utc_str: str, fmt: str = "%I:%M %p") -> str:
     """Convert a UTC ISO timestamp string to local time display."""
     dt = datetime.fromisoformat(utc_str).astimezone(TIMEZONE)
@@ -52,7 +74,7 @@ def format_local_time(utc_str: str, fmt: str = "%I:%M %p") -> str:
 
 def local_today() -> str:
     """Return today's date in local timezone as YYYY-MM-DD."""
-    return datetime.now(TIMEZONE).strftime("%Y-%m-%d")
+    return datetime.now(TIMEZONE).date().isoformat()
 
 # API region mapping
 API_BASES: dict[str, str] = {
@@ -61,12 +83,14 @@ API_BASES: dict[str, str] = {
 }
 
 
+@functools.cache
 def get_api_base() -> str:
     if VICOHOME_API_BASE:
         return VICOHOME_API_BASE.rstrip("/")
     return API_BASES.get(VICOHOME_REGION.lower(), API_BASES["us"])
 
 
+@functools.cache
 def get_country_no() -> str:
     base = get_api_base()
     if "-eu" in base or "vicoo.tech" in base:
@@ -5,181 +5,99 @@ Then open http://localhost:8000
 """
 from __future__ import annotations
 
-import json
+import functools
+import hashlib
 import logging
+import os
+import stat
+import string
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 import uvicorn
-from fastapi import FastAPI, Form
+from fastapi import FastAPI, Form, Request, Response
 from fastapi.responses import FileResponse, HTMLResponse, RedirectResponse
 
 from freebird.config import MEDIA_DIR, ensure_dirs
+from freebird.ground_truth import (
+    CHECKPOINT_EVERY,
+    GROUND_TRUTH_LOG,
+    append_label,
+    checkpoint,
+    load_ground_truth,
+)
 from freebird.storage.database import Database
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)-8s %(message)s")
 logger = logging.getLogger("freebird.eval_label")
 
-GROUND_TRUTH_PATH = Path(__file__).resolve().parents[2] / "eval" / "ground_truth.json"
-
-app = FastAPI()
-
-
-def _load_ground_truth() -> dict:
-    if GROUND_TRUTH_PATH.exists():
-        return json.loads(GROUND_TRUTH_PATH.read_text())
-    return {}
-
-
-def _save_ground_truth(data: dict) -> None:
-    GROUND_TRUTH_PATH.write_text(json.dumps(data, indent=2) + "\n")
-
-
-def _get_sightings_to_label(db: Database, ground_truth: dict) -> list[dict]:
-    """Get sightings with images that haven't been labeled yet."""
-    rows = db.conn.execute(
-        """SELECT id, image_path, timestamp, device_name, species
-           FROM sightings
-           WHERE image_path IS NOT NULL
-           ORDER BY timestamp ASC"""
-    ).fetchall()
-    return [
-        {"id": r["id"], "image_path": r["image_path"], "timestamp": r["timestamp"],
-         "device_name": r["device_name"], "species": r["species"]}
-        for r in rows if r["id"] not in ground_truth
-    ]
-
-
-def _get_known_species(db: Database) -> list[str]:
-    """Get distinct species names for autocomplete."""
-    rows = db.conn.execute(
-        "SELECT DISTINCT species FROM sightings WHERE species IS NOT NULL ORDER BY species"
-    ).fetchall()
-    return [r["species"] for r in rows]
-
-
-@app.get("/media/{path:path}")
-async def serve_media(path: str):
-    file_path = (MEDIA_DIR / path).resolve()
-    if not file_path.is_relative_to(MEDIA_DIR.resolve()):
-        return HTMLResponse("Forbidden", status_code=403)
-    if file_path.exists():
-        return FileResponse(file_path)
-    return HTMLResponse("Not found", status_code=404)
-
-
-@app.post("/label")
-async def save_label(
-    sighting_id: str = Form(...),
-    category: str = Form(...),
-    species: str = Form(""),
-    animal_type: str = Form(""),
-    notes: str = Form(""),
-):
-    gt = _load_ground_truth()
-
-    if category == "bird":
-        gt[sighting_id] = {"label": species.strip(), "is_bird": True}
-    elif category == "critter":
-        gt[sighting_id] = {"label": animal_type.strip(), "is_bird": False}
-    else:
-        gt[sighting_id] = {"label": "empty", "is_bird": False}
-
-    if notes.strip():
-        gt[sighting_id]["notes"] = notes.strip()
-
-    _save_ground_truth(gt)
-    logger.info("Labeled %s: %s", sighting_id, gt[sighting_id])
-    return RedirectResponse("/", status_code=303)
-
-
-@app.post("/skip")
-async def skip(sighting_id: str = Form(...)):
-    return RedirectResponse("/", status_code=303)
-
-
-@app.get("/")
-async def index():
-    ensure_dirs()
-    db = Database()
-    gt = _load_ground_truth()
-    unlabeled = _get_sightings_to_label(db, gt)
-    species_list = _get_known_species(db)
-    total = db.conn.execute("SELECT COUNT(*) FROM sightings WHERE image_path IS NOT NULL").fetchone()[0]
-    labeled_count = len(gt)
-    db.close()
-
-    if not unlabeled:
-        return HTMLResponse(f"<h1>All done!</h1><p>{labeled_count} / {total} labeled.</p>")
-
-    s = unlabeled[0]
-    # Convert absolute image path to relative media URL
-    image_path = Path(s["image_path"])
-    try:
-        rel_path = image_path.relative_to(MEDIA_DIR)
-    except ValueError:
-        rel_path = image_path.name
-    image_url = f"/media/{rel_path}"
-
-    species_options = "\n".join(f'<option value="{sp}">' for sp in species_list)
+# Resolved once; serve_media checks every requested path against it
+MEDIA_ROOT = os.path.realpath(MEDIA_DIR)
+
+
+# Page template, parsed once at import; CSS is served separately so browsers cache it
+LABEL_CSS = """\
+* { box-sizing: border-box; margin: 0; padding: 0; }
+body { font-family: -apple-system, system-ui, sans-serif; background: #1a1a2e; color: #e0e0e0; }
+.container { max-width: 900px; margin: 0 auto; padding: 20px; }
+.header { display: flex; justify-content: space-between; align-items: center; margin-bottom: 16px; }
+h1 { font-size: 1.4em; }
+.progress { color: #888; font-size: 0.95em; }
+.main { display: flex; gap: 24px; }
+.image-panel { flex: 1; }
+.image-panel img { width: 100%; border-radius: 8px; border: 2px solid #333; }
+.form-panel { width: 300px; flex-shrink: 0; }
+.meta { font-size: 0.85em; color: #888; margin-bottom: 12px; }
+.radio-group { display: flex; gap: 8px; margin-bottom: 16px; }
+.radio-group label {
+  flex: 1; text-align: center; padding: 10px 0; border-radius: 6px;
+  background: #2a2a3e; cursor: pointer; transition: all 0.15s;
+  border: 2px solid transparent;
+}
+.radio-group input { display: none; }
+.radio-group input:checked + span { font-weight: 600; }
+.radio-group label:has(input:checked) { border-color: #5b8def; background: #2a3a5e; }
+.field { margin-bottom: 12px; }
+.field label { display: block; font-size: 0.85em; color: #aaa; margin-bottom: 4px; }
+.field input, .field select, .field textarea {
+  width: 100%; padding: 8px 10px; border-radius: 6px; border: 1px solid #444;
+  background: #2a2a3e; color: #e0e0e0; font-size: 0.95em;
+}
+.field textarea { resize: vertical; height: 60px; }
+.buttons { display: flex; gap: 8px; margin-top: 16px; }
+.buttons button {
+  flex: 1; padding: 10px; border: none; border-radius: 6px;
+  font-size: 1em; cursor: pointer; font-weight: 500;
+}
+.btn-save { background: #5b8def; color: #fff; }
+.btn-save:hover { background: #4a7de0; }
+.btn-skip { background: #3a3a4e; color: #ccc; }
+.btn-skip:hover { background: #4a4a5e; }
+.hint { font-size: 0.8em; color: #666; margin-top: 8px; text-align: center; }
+#species-field, #animal-field { display: none; }
+"""
+CSS_URL = f"/static/label.css?v={hashlib.sha1(LABEL_CSS.encode()).hexdigest()[:8]}"
 
-    html = f"""<!DOCTYPE html>
+LABEL_PAGE = string.Template("""<!DOCTYPE html>
 <html><head>
 <meta charset="utf-8">
 <title>FreeBird Labeler</title>
-<style>
-  * {{ box-sizing: border-box; margin: 0; padding: 0; }}
-  body {{ font-family: -apple-system, system-ui, sans-serif; background: #1a1a2e; color: #e0e0e0; }}
-  .container {{ max-width: 900px; margin: 0 auto; padding: 20px; }}
-  .header {{ display: flex; justify-content: space-between; align-items: center; margin-bottom: 16px; }}
-  h1 {{ font-size: 1.4em; }}
-  .progress {{ color: #888; font-size: 0.95em; }}
-  .main {{ display: flex; gap: 24px; }}
-  .image-panel {{ flex: 1; }}
-  .image-panel img {{ width: 100%; border-radius: 8px; border: 2px solid #333; }}
-  .form-panel {{ width: 300px; flex-shrink: 0; }}
-  .meta {{ font-size: 0.85em; color: #888; margin-bottom: 12px; }}
-  .radio-group {{ display: flex; gap: 8px; margin-bottom: 16px; }}
-  .radio-group label {{
-    flex: 1; text-align: center; padding: 10px 0; border-radius: 6px;
-    background: #2a2a3e; cursor: pointer; transition: all 0.15s;
-    border: 2px solid transparent;
-  }}
-  .radio-group input {{ display: none; }}
-  .radio-group input:checked + span {{ font-weight: 600; }}
-  .radio-group label:has(input:checked) {{ border-color: #5b8def; background: #2a3a5e; }}
-  .field {{ margin-bottom: 12px; }}
-  .field label {{ display: block; font-size: 0.85em; color: #aaa; margin-bottom: 4px; }}
-  .field input, .field select, .field textarea {{
-    width: 100%; padding: 8px 10px; border-radius: 6px; border: 1px solid #444;
-    background: #2a2a3e; color: #e0e0e0; font-size: 0.95em;
-  }}
-  .field textarea {{ resize: vertical; height: 60px; }}
-  .buttons {{ display: flex; gap: 8px; margin-top: 16px; }}
-  .buttons button {{
-    flex: 1; padding: 10px; border: none; border-radius: 6px;
-    font-size: 1em; cursor: pointer; font-weight: 500;
-  }}
-  .btn-save {{ background: #5b8def; color: #fff; }}
-  .btn-save:hover {{ background: #4a7de0; }}
-  .btn-skip {{ background: #3a3a4e; color: #ccc; }}
-  .btn-skip:hover {{ background: #4a4a5e; }}
-  .hint {{ font-size: 0.8em; color: #666; margin-top: 8px; text-align: center; }}
-  #species-field, #animal-field {{ display: none; }}
-</style>
+<link rel="stylesheet" href="$css_url">
+$prefetch
 </head><body>
 <div class="container">
   <div class="header">
     <h1>FreeBird Labeler</h1>
-    <div class="progress">{labeled_count} / {total} labeled &middot; {len(unlabeled)} remaining</div>
+    <div class="progress">$labeled_count / $total labeled &middot; $remaining remaining</div>
   </div>
   <div class="main">
     <div class="image-panel">
-      <img src="{image_url}" alt="keyshot">
-      <div class="meta">{s['timestamp']} &middot; {s['device_name'] or ''} &middot; Current: {s['species'] or 'none'}</div>
+      <img src="$image_url" alt="keyshot">
+      <div class="meta">$timestamp &middot; $device_name &middot; Current: $current_species</div>
     </div>
     <div class="form-panel">
       <form id="label-form" method="post" action="/label">
-        <input type="hidden" name="sighting_id" value="{s['id']}">
+        <input type="hidden" name="sighting_id" value="$sighting_id">
 
         <div class="radio-group">
           <label><input type="radio" name="category" value="bird" onchange="toggleFields()"><span>Bird</span></label>
@@ -190,7 +108,7 @@ async def index():
         <div class="field" id="species-field">
           <label>Species</label>
           <input type="text" name="species" list="species-list" placeholder="e.g. Dark-eyed Junco" autocomplete="off">
-          <datalist id="species-list">{species_options}</datalist>
+          <datalist id="species-list">$species_options</datalist>
         </div>
 
         <div class="field" id="animal-field">
@@ -215,24 +133,208 @@ async def index():
         <div class="hint">Enter = save &middot; &rarr; = skip</div>
       </form>
       <form id="skip-form" method="post" action="/skip" style="display:none">
-        <input type="hidden" name="sighting_id" value="{s['id']}">
+        <input type="hidden" name="sighting_id" value="$sighting_id">
       </form>
     </div>
   </div>
 </div>
 <script>
-function toggleFields() {{
+function toggleFields() {
   const cat = document.querySelector('input[name="category"]:checked');
   document.getElementById('species-field').style.display = cat && cat.value === 'bird' ? 'block' : 'none';
   document.getElementById('animal-field').style.display = cat && cat.value === 'critter' ? 'block' : 'none';
-}}
-document.addEventListener('keydown', (e) => {{
+}
+document.addEventListener('keydown', (e) => {
   if (e.target.tagName === 'INPUT' || e.target.tagName === 'TEXTAREA' || e.target.tagName === 'SELECT') return;
   if (e.key === 'ArrowRight') document.getElementById('skip-form').submit();
-}});
+});
 </script>
-</body></html>"""
+</body></html>""")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One writer and one read-only connection for the server's lifetime, opened
+    # (and PRAGMA-configured) before the first request instead of per request
+    ensure_dirs()
+    app.state.db = Database()
+    app.state.reader = Database(read_only=True)
+    # ground_truth.json (+ its log) is the source of truth; fold in any log left by
+    # a previous run and refresh the SQL mirror on startup
+    gt = _load_ground_truth()
+    if GROUND_TRUTH_LOG.exists():
+        checkpoint(gt)
+    app.state.db.replace_ground_truth(gt)
+    try:
+        yield
+    finally:
+        try:
+            if _pending_labels:
+                checkpoint(gt)
+            app.state.reader.close()
+        finally:
+            app.state.db.close()
+
+
+app = FastAPI(lifespan=lifespan)
+
+
+# Labels as of the last load plus every label saved since; the in-process copy is
+# authoritative while the server runs
+_gt_cache: dict | None = None
+# Labels appended to the log since the last checkpoint
+_pending_labels = 0
+
+
+def _load_ground_truth() -> dict:
+    global _gt_cache
+    if _gt_cache is None:
+        _gt_cache = load_ground_truth()
+    return _gt_cache
+
+
+def _record_label(sighting_id: str, label: dict) -> None:
+    """Append one label to the log; rewrite the full JSON only every CHECKPOINT_EVERY."""
+    global _pending_labels
+    gt = _load_ground_truth()
+    gt[sighting_id] = label
+    append_label(sighting_id, label)
+    _pending_labels += 1
+    if _pending_labels >= CHECKPOINT_EVERY:
+        checkpoint(gt)
+        _pending_labels = 0
+
+
+def _get_next_to_label(db: Database) -> tuple[dict | None, dict | None, int]:
+    """The next two unlabeled sightings with images (oldest first) and how many remain."""
+    rows = db.conn.execute(
+        """SELECT s.id, s.image_path, s.timestamp, s.device_name, s.species,
+                  COUNT(*) OVER () AS remaining
+           FROM sightings s
+           LEFT JOIN ground_truth g ON g.id = s.id
+           WHERE s.image_path IS NOT NULL AND g.id IS NULL
+           ORDER BY s.timestamp ASC LIMIT 2"""
+    ).fetchall()
+    if not rows:
+        return None, None, 0
+    following = dict(rows[1]) if len(rows) > 1 else None
+    return dict(rows[0]), following, rows[0]["remaining"]
+
+
+def _media_url(image_path: str) -> str:
+    """Convert an absolute image path to its /media URL."""
+    path = Path(image_path)
+    try:
+        rel_path = path.relative_to(MEDIA_DIR)
+    except ValueError:
+        rel_path = path.name
+    return f"/media/{rel_path}"
+
+
+def _get_known_species(db: Database) -> list[str]:
+    """Get distinct species names for autocomplete."""
+    rows = db.conn.execute(
+        "SELECT DISTINCT species FROM sightings WHERE species IS NOT NULL ORDER BY species"
+    ).fetchall()
+    return [r["species"] for r in rows]
+
+
+@functools.lru_cache(maxsize=1)
+def _species_options(species: tuple[str, ...]) -> str:
+    """<option> tags for the autocomplete list; rebuilt only when the species set changes."""
+    return "\n".join(f'<option value="{sp}">' for sp in species)
+
+
+@app.get("/static/label.css")
+async def serve_css():
+    # URL carries a content hash, so the stylesheet can be cached indefinitely
+    return Response(
+        LABEL_CSS,
+        media_type="text/css",
+        headers={"Cache-Control": "public, max-age=31536000, immutable"},
+    )
+
+
+@app.get("/media/{path:path}")
+async def serve_media(path: str, request: Request):
+    file_path = os.path.realpath(os.path.join(MEDIA_ROOT, path))
+    if not file_path.startswith(MEDIA_ROOT + os.sep):
+        return HTMLResponse("Forbidden", status_code=403)
+    try:
+        st = os.stat(file_path)
+    except OSError:  # Missing, or a path through a file (NotADirectoryError)
+        return HTMLResponse("Not found", status_code=404)
+    if not stat.S_ISREG(st.st_mode):
+        return HTMLResponse("Not found", status_code=404)
+    # Keyshots never change once written, so (mtime, size) identifies the content
+    etag = f'W/"{st.st_mtime_ns:x}-{st.st_size:x}"'
+    headers = {"ETag": etag, "Cache-Control": "private, max-age=86400"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return FileResponse(file_path, headers=headers, stat_result=st)
+
+
+@app.post("/label")
+async def save_label(
+    sighting_id: str = Form(...),
+    category: str = Form(...),
+    species: str = Form(""),
+    animal_type: str = Form(""),
+    notes: str = Form(""),
+):
+    if category == "bird":
+        label = {"label": species.strip(), "is_bird": True}
+    elif category == "critter":
+        label = {"label": animal_type.strip(), "is_bird": False}
+    else:
+        label = {"label": "empty", "is_bird": False}
+
+    if notes.strip():
+        label["notes"] = notes.strip()
+
+    _record_label(sighting_id, label)
+    app.state.db.upsert_ground_truth(
+        sighting_id, label["label"], label["is_bird"], label.get("notes")
+    )
+    logger.info("Labeled %s: %s", sighting_id, label)
+    return RedirectResponse("/", status_code=303)
+
+
+@app.post("/skip")
+async def skip(sighting_id: str = Form(...)):
+    return RedirectResponse("/", status_code=303)
+
+
+@app.get("/")
+async def index():
+    db: Database = app.state.reader
+    gt = _load_ground_truth()
+    s, following, remaining = _get_next_to_label(db)
+    species_list = _get_known_species(db)
+    total = db.conn.execute("SELECT COUNT(*) FROM sightings WHERE image_path IS NOT NULL").fetchone()[0]
+    labeled_count = len(gt)
+
+    if s is None:
+        return HTMLResponse(f"<h1>All done!</h1><p>{labeled_count} / {total} labeled.</p>")
 
+    # Fetch the next keyshot while this one is being labeled
+    prefetch = ""
+    if following:
+        prefetch = f'<link rel="prefetch" as="image" href="{_media_url(following["image_path"])}">'
+
+    html = LABEL_PAGE.substitute(
+        css_url=CSS_URL,
+        prefetch=prefetch,
+        labeled_count=labeled_count,
+        total=total,
+        remaining=remaining,
+        image_url=_media_url(s["image_path"]),
+        timestamp=s["timestamp"],
+        device_name=s["device_name"] or "",
+        current_species=s["species"] or "none",
+        sighting_id=s["id"],
+        species_options=_species_options(tuple(species_list)),
+    )
     return HTMLResponse(html)
 
 
@@ -3,13 +3,16 @@
 Usage:
   uv run python -m freebird.eval_run --model google-gla:gemini-2.5-flash --prompt default
   uv run python -m freebird.eval_run --model anthropic:claude-sonnet-4-5-20250929 --prompt default
+
+Cases run concurrently (--concurrency) under a requests-per-minute cap (--rpm).
+The defaults fit the Gemini free tier.
 """
 from __future__ import annotations
 
 import argparse
+import asyncio
 import json
 import logging
-import time
 from datetime import datetime, timezone
 from pathlib import Path
 
@@ -18,16 +21,17 @@ from pydantic_evals import Case, Dataset
 from pydantic_evals.evaluators import Evaluator, EvaluatorContext
 
 from freebird.analysis.vision import VisionAnalysis, load_prompt
-from freebird.config import VISION_MODEL, ensure_dirs
+from freebird.config import VISION_MODEL, VISION_RPM, ensure_dirs
+from freebird.ground_truth import EVAL_DIR, GROUND_TRUTH_LOG, GROUND_TRUTH_PATH, load_ground_truth
+from freebird.ratelimit import AsyncLimiter
 from freebird.storage.database import Database
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)-8s %(message)s")
 logger = logging.getLogger("freebird.eval_run")
 
-EVAL_DIR = Path(__file__).resolve().parents[2] / "eval"
-GROUND_TRUTH_PATH = EVAL_DIR / "ground_truth.json"
 RESULTS_PATH = EVAL_DIR / "results.jsonl"
 DETAILS_DIR = EVAL_DIR / "details"
+EVAL_CONCURRENCY = 4
 
 
 class IsBirdCorrect(Evaluator[str, VisionAnalysis, dict]):
@@ -37,71 +41,107 @@ class IsBirdCorrect(Evaluator[str, VisionAnalysis, dict]):
         return ctx.output.is_bird == ctx.metadata["is_bird"]
 
 
-def _species_eq(a: str | None, b: str | None) -> bool:
-    """Case-insensitive species name equality, None-safe."""
-    if a is None or b is None:
-        return False
-    return a.strip().lower() == b.strip().lower()
-
-
-def _contains_ci(text: str | None, substring: str | None) -> bool:
-    """Case-insensitive substring check, None-safe."""
-    if text is None or substring is None:
-        return False
-    return substring.strip().lower() in text.strip().lower()
+def _norm(text: str | None) -> str | None:
+    """Strip and lowercase for case-insensitive matching, None-safe."""
+    return text.strip().lower() if text is not None else None
 
 
 class SpeciesMatch(Evaluator[str, VisionAnalysis, dict]):
     """Did the model get the species/animal_type right?"""
 
     def evaluate(self, ctx: EvaluatorContext[str, VisionAnalysis, dict]) -> bool:
-        expected = ctx.expected_output
+        # Normalized once when the case was built
+        expected = ctx.metadata["expected_norm"]
         output = ctx.output
 
         # Empty frame expected — nothing detected is correct
         if expected == "empty":
             return not output.is_bird and output.animal_type is None
 
+        species = _norm(output.species)
+
         # Bird expected — exact species match
         if ctx.metadata["is_bird"]:
-            return _species_eq(output.species, expected)
+            return species == expected
 
         # Non-bird animal expected (e.g., "squirrel")
-        return (_contains_ci(output.animal_type, expected) or
-                _contains_ci(output.species, expected))
+        animal_type = _norm(output.animal_type)
+        return ((animal_type is not None and expected in animal_type) or
+                (species is not None and expected in species))
 
 
-def _build_task(agent: Agent):
+def _build_task(agent: Agent, limiter: AsyncLimiter):
     """Create the task function for pydantic-evals."""
-    def vision_task(image_path_str: str) -> VisionAnalysis:
-        image_path = Path(image_path_str)
-        result = agent.run_sync([
-            "Analyze this bird feeder camera image.",
-            BinaryContent(data=image_path.read_bytes(), media_type="image/jpeg"),
-        ])
-        time.sleep(7)  # Gemini free tier rate limit
+    async def vision_task(image_path_str: str) -> VisionAnalysis:
+        image_bytes = await asyncio.to_thread(Path(image_path_str).read_bytes)
+        async with limiter:
+            result = await agent.run([
+                "Analyze this bird feeder camera image.",
+                BinaryContent(data=image_bytes, media_type="image/jpeg"),
+            ])
         return result.output
     return vision_task
 
 
+def _case_record(c) -> dict:
+    """Details row for a case that produced output."""
+    output: VisionAnalysis = c.output
+    is_bird_ok = c.assertions.get("IsBirdCorrect")
+    species_ok = c.assertions.get("SpeciesMatch")
+    return {
+        "id": c.name,
+        "expected": c.expected_output,
+        "is_bird_expected": c.metadata["is_bird"] if c.metadata else None,
+        "predicted_species": output.species,
+        "predicted_animal_type": output.animal_type,
+        "predicted_is_bird": output.is_bird,
+        "confidence": output.confidence,
+        "is_bird_correct": is_bird_ok.value if is_bird_ok else None,
+        "species_correct": species_ok.value if species_ok else None,
+        "error": None,
+    }
+
+
+def _failure_record(fail) -> dict:
+    """Details row for a case whose task raised."""
+    return {
+        "id": fail.name,
+        "expected": fail.expected_output,
+        "is_bird_expected": fail.metadata["is_bird"] if fail.metadata else None,
+        "predicted_species": None,
+        "predicted_animal_type": None,
+        "predicted_is_bird": None,
+        "confidence": None,
+        "is_bird_correct": None,
+        "species_correct": None,
+        "error": fail.error_message,
+    }
+
+
 def run() -> None:
     parser = argparse.ArgumentParser(description="Run vision eval")
     parser.add_argument("--model", default=VISION_MODEL, help="PydanticAI model string")
     parser.add_argument("--prompt", default="default", help="Prompt name from eval/prompts/")
+    parser.add_argument("--rpm", type=float, default=VISION_RPM, help="Max model requests per minute")
+    parser.add_argument(
+        "--concurrency", type=int, default=EVAL_CONCURRENCY, help="Max cases in flight"
+    )
     args = parser.parse_args()
 
     ensure_dirs()
 
-    if not GROUND_TRUTH_PATH.exists():
+    if not GROUND_TRUTH_PATH.exists() and not GROUND_TRUTH_LOG.exists():
         logger.error("No ground truth file at %s — run eval_label.py first", GROUND_TRUTH_PATH)
         return
 
-    ground_truth = json.loads(GROUND_TRUTH_PATH.read_text())
+    ground_truth = load_ground_truth()
     if not ground_truth:
         logger.error("Ground truth is empty — label some images first")
         return
 
     db = Database()
+    image_paths = db.get_image_paths(list(ground_truth))
+    db.close()
 
     # Build cases from ground truth
     cases = []
@@ -111,19 +151,16 @@ def run() -> None:
         if not label["label"] and label["is_bird"]:
             skipped += 1
             continue
-        row = db.conn.execute(
-            "SELECT image_path FROM sightings WHERE id = ?", (sighting_id,)
-        ).fetchone()
-        if not row or not row["image_path"] or not Path(row["image_path"]).exists():
+        image_path = image_paths.get(sighting_id)
+        if not image_path or not Path(image_path).exists():
             skipped += 1
             continue
         cases.append(Case(
             name=sighting_id,
-            inputs=row["image_path"],
+            inputs=image_path,
             expected_output=label["label"],
-            metadata={"is_bird": label["is_bird"]},
+            metadata={"is_bird": label["is_bird"], "expected_norm": _norm(label["label"])},
         ))
-    db.close()
 
     if skipped:
         logger.warning("Skipped %d sightings (missing images)", skipped)
@@ -142,7 +179,9 @@ def run() -> None:
         evaluators=[IsBirdCorrect(), SpeciesMatch()],
     )
 
-    report = dataset.evaluate_sync(_build_task(agent), max_concurrency=1)
+    # Burst of 1 spaces requests 60/rpm apart so no minute exceeds --rpm
+    task = _build_task(agent, AsyncLimiter(args.rpm, 60, burst=1))
+    report = asyncio.run(dataset.evaluate(task, max_concurrency=args.concurrency))
     report.print(include_input=True, include_output=True)
 
     # Compute summary stats over successful cases only
@@ -188,37 +227,8 @@ def run() -> None:
     DETAILS_DIR.mkdir(exist_ok=True)
     details_path = DETAILS_DIR / f"{timestamp}_{model_slug}.jsonl"
 
-    with open(details_path, "w") as f:
-        for c in report.cases:
-            output: VisionAnalysis = c.output
-            is_bird_ok = c.assertions.get("IsBirdCorrect")
-            species_ok = c.assertions.get("SpeciesMatch")
-            f.write(json.dumps({
-                "id": c.name,
-                "expected": c.expected_output,
-                "is_bird_expected": c.metadata["is_bird"] if c.metadata else None,
-                "predicted_species": output.species,
-                "predicted_animal_type": output.animal_type,
-                "predicted_is_bird": output.is_bird,
-                "confidence": output.confidence,
-                "is_bird_correct": is_bird_ok.value if is_bird_ok else None,
-                "species_correct": species_ok.value if species_ok else None,
-                "error": None,
-            }) + "\n")
-
-        for fail in report.failures:
-            f.write(json.dumps({
-                "id": fail.name,
-                "expected": fail.expected_output,
-                "is_bird_expected": fail.metadata["is_bird"] if fail.metadata else None,
-                "predicted_species": None,
-                "predicted_animal_type": None,
-                "predicted_is_bird": None,
-                "confidence": None,
-                "is_bird_correct": None,
-                "species_correct": None,
-                "error": fail.error_message,
-            }) + "\n")
+    records = [*map(_case_record, report.cases), *map(_failure_record, report.failures)]
+    details_path.write_text("".join(json.dumps(r) + "\n" for r in records))
 
     logger.info("Per-case details written to %s", details_path)
 
@@ -0,0 +1,46 @@
+"""Human-labeled eval dataset (eval/ground_truth.json) shared by eval_label and eval_run.
+
+New labels are appended to ground_truth.log.jsonl, one line per label, and folded
+into the canonical JSON every CHECKPOINT_EVERY labels. Readers always see the JSON
+with the log replayed on top.
+"""
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+EVAL_DIR = Path(__file__).resolve().parents[2] / "eval"
+GROUND_TRUTH_PATH = EVAL_DIR / "ground_truth.json"
+GROUND_TRUTH_LOG = EVAL_DIR / "ground_truth.log.jsonl"
+CHECKPOINT_EVERY = 100
+
+
+def load_ground_truth() -> dict:
+    """Canonical labels with any not-yet-checkpointed log entries applied."""
+    labels = json.loads(GROUND_TRUTH_PATH.read_text()) if GROUND_TRUTH_PATH.exists() else {}
+    if GROUND_TRUTH_LOG.exists():
+        with GROUND_TRUTH_LOG.open() as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    break  # Torn last line from a crash mid-append
+                labels[entry.pop("id")] = entry
+    return labels
+
+
+def append_label(sighting_id: str, label: dict) -> None:
+    """Record one label without rewriting the whole dataset."""
+    with GROUND_TRUTH_LOG.open("a") as f:
+        f.write(json.dumps({"id": sighting_id, **label}) + "\n")
+
+
+def checkpoint(labels: dict) -> None:
+    """Write labels as the canonical JSON, then drop the log it now contains."""
+    # Write then rename so a crash mid-write never leaves a truncated file;
+    # replaying a log that survives a crash here is harmless
+    tmp_path = GROUND_TRUTH_PATH.with_suffix(".json.tmp")
+    tmp_path.write_text(json.dumps(labels, indent=2) + "\n")
+    os.replace(tmp_path, GROUND_TRUTH_PATH)
+    GROUND_TRUTH_LOG.unlink(missing_ok=True)
@@ -29,7 +29,7 @@ async def _run() -> None:
     logger.info("Initializing FreeBird...")
     auth = AuthManager()
     api = VicoHomeAPI(auth)
-    db = Database()
+    db = Database(background_checkpoint=True)
     bot = TelegramBot(db)
 
     pipeline = Pipeline(api=api, db=db, bot=bot)
@@ -46,7 +46,7 @@ async def _run() -> None:
         loop.add_signal_handler(sig, _signal_handler)
 
     # Initialize the bot application
-    await bot.app.initialize()
+    await bot.initialize()
     await bot.app.start()
     await bot.app.updater.start_polling(drop_pending_updates=True)
 
@@ -54,7 +54,7 @@ async def _run() -> None:
 
     # Run pipeline + daily summary scheduler
     pipeline_task = asyncio.create_task(pipeline.run())
-    summary_task = asyncio.create_task(_daily_summary_loop(bot, stop_event))
+    summary_task = asyncio.create_task(_daily_summary_loop(bot, db, stop_event))
 
     await stop_event.wait()
 
@@ -75,7 +75,9 @@ async def _run() -> None:
     logger.info("FreeBird stopped.")
 
 
-async def _daily_summary_loop(bot: TelegramBot, stop_event: asyncio.Event) -> None:
+async def _daily_summary_loop(
+    bot: TelegramBot, db: Database, stop_event: asyncio.Event
+) -> None:
     """Send daily summary at 6pm EST. Sleeps until the next occurrence."""
     while not stop_event.is_set():
         now = datetime.now(TIMEZONE)
@@ -97,6 +99,12 @@ async def _daily_summary_loop(bot: TelegramBot, stop_event: asyncio.Event) -> No
         except Exception:
             logger.exception("Failed to send daily summary")
 
+        # The process runs for weeks; refresh planner stats once a day, not just at exit
+        try:
+            db.optimize()
+        except Exception:
+            logger.exception("PRAGMA optimize failed")
+
 
 def main() -> None:
     try:
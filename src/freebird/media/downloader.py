@@ -2,14 +2,29 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import os
 from pathlib import Path
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from freebird.config import MEDIA_DIR
 
 logger = logging.getLogger(__name__)
 
+# BirdNET v2.4 consumes 48 kHz mono audio; extracting in that shape means the
+# model's loader never has to downmix or resample
+AUDIO_SAMPLE_RATE = 48000
+DOWNLOAD_CHUNK_BYTES = 64 * 1024
+
+# Each audio extraction runs single-threaded; cap how many run at once so a
+# backfill of many clips doesn't oversubscribe the CPU
+_audio_slots = asyncio.Semaphore(max(1, (os.cpu_count() or 2) // 2))
+
+# Shared so keyshot downloads reuse TCP/TLS connections to the CDN across polls
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
 
 def _event_dir(trace_id: str) -> Path:
     d = MEDIA_DIR / trace_id
@@ -23,14 +38,22 @@ def download_image(url: str, trace_id: str) -> Path | None:
     dest = _event_dir(trace_id) / "keyshot.jpg"
     if dest.exists():
         return dest
+    # Stream into a .part file and rename, so a failed download never looks complete
+    part = dest.with_suffix(".part")
     try:
-        resp = requests.get(url, timeout=30)
-        resp.raise_for_status()
-        dest.write_bytes(resp.content)
-        logger.info("Downloaded keyshot for %s (%.1f KB)", trace_id, len(resp.content) / 1024)
+        size = 0
+        with _session.get(url, timeout=30, stream=True) as resp:
+            resp.raise_for_status()
+            with part.open("wb") as f:
+                for chunk in resp.iter_content(DOWNLOAD_CHUNK_BYTES):
+                    f.write(chunk)
+                    size += len(chunk)
+        os.replace(part, dest)
+        logger.info("Downloaded keyshot for %s (%.1f KB)", trace_id, size / 1024)
         return dest
     except Exception:
         logger.exception("Failed to download image for %s", trace_id)
+        part.unlink(missing_ok=True)
         return None
 
 
@@ -69,18 +92,21 @@ async def extract_audio(video_path: Path, trace_id: str) -> Path | None:
     if dest.exists():
         return dest
     try:
-        proc = await asyncio.create_subprocess_exec(
-            "ffmpeg", "-y",
-            "-i", str(video_path),
-            "-vn",
-            "-acodec", "pcm_s16le",
-            "-ar", "48000",
-            "-ac", "1",
-            str(dest),
-            stdout=asyncio.subprocess.DEVNULL,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        _, stderr = await proc.communicate()
+        async with _audio_slots:
+            proc = await asyncio.create_subprocess_exec(
+                "ffmpeg", "-y",
+                "-i", str(video_path),
+                "-vn",
+                "-acodec", "pcm_s16le",
+                "-ar", str(AUDIO_SAMPLE_RATE),
+                "-ac", "1",
+                "-threads", "1",
+                "-f", "wav",
+                str(dest),
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            _, stderr = await proc.communicate()
         if proc.returncode != 0:
             logger.error("Audio extraction failed for %s: %s",
                          trace_id, stderr.decode()[-500:])
@@ -92,3 +118,27 @@ async def extract_audio(video_path: Path, trace_id: str) -> Path | None:
         logger.exception("Failed to extract audio for %s", trace_id)
         dest.unlink(missing_ok=True)
         return None
+
+
+async def downscale_jpeg(data: bytes, max_edge: int) -> bytes | None:
+    """Re-encode a JPEG so neither side exceeds max_edge (never upscales)."""
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            "ffmpeg",
+            "-f", "image2pipe", "-i", "pipe:0",
+            "-vf", (f"scale='min({max_edge},iw)':'min({max_edge},ih)'"
+                    ":force_original_aspect_ratio=decrease"),
+            "-q:v", "3",
+            "-f", "image2pipe", "-vcodec", "mjpeg", "pipe:1",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        stdout, stderr = await proc.communicate(data)
+        if proc.returncode != 0 or not stdout:
+            logger.error("ffmpeg JPEG re-encode failed: %s", stderr.decode()[-500:])
+            return None
+        return stdout
+    except Exception:
+        logger.exception("Failed to re-encode JPEG")
+        return None
@@ -4,6 +4,7 @@ import asyncio
 import logging
 import time
 from datetime import datetime, timezone
+from pathlib import Path
 
 from freebird.analysis.vision import analyze_image
 from freebird.bot.telegram import TelegramBot
@@ -17,6 +18,16 @@ logger = logging.getLogger(__name__)
 
 # Alert if pipeline hasn't processed successfully for this many seconds
 ERROR_ALERT_THRESHOLD = 5 * 60
+# Never look further back than this for missed events
+LOOKBACK_SECONDS = 3600
+# Re-scan this far behind the newest event seen, for events VicoHome publishes late
+EVENT_OVERLAP_SECONDS = 10 * 60
+# Quiet cycles double the poll delay, up to this multiple of POLL_INTERVAL_SECONDS
+MAX_POLL_BACKOFF = 4
+
+
+async def _none() -> None:
+    return None
 
 
 class Pipeline:
@@ -31,6 +42,8 @@ class Pipeline:
         self.bot = bot
         self._last_success: float = time.time()
         self._error_alerted: bool = False
+        # Start of the next poll window; advances behind the newest event seen
+        self._since: float = time.time() - LOOKBACK_SECONDS
 
     async def run(self) -> None:
         logger.info("Pipeline started (polling every %ds)", POLL_INTERVAL_SECONDS)
@@ -38,10 +51,15 @@ class Pipeline:
         # Bootstrap: check last hour on first run
         await self._poll_cycle()
 
+        delay = POLL_INTERVAL_SECONDS
         while True:
-            await asyncio.sleep(POLL_INTERVAL_SECONDS)
+            await asyncio.sleep(delay)
             try:
-                await self._poll_cycle()
+                new_count = await self._poll_cycle()
+                if new_count:
+                    delay = POLL_INTERVAL_SECONDS
+                else:
+                    delay = min(delay * 2, POLL_INTERVAL_SECONDS * MAX_POLL_BACKOFF)
                 self._last_success = time.time()
                 self._error_alerted = False
             except Exception:
@@ -53,57 +71,68 @@ class Pipeline:
                     )
                     self._error_alerted = True
 
-    async def _poll_cycle(self) -> None:
+    async def _poll_cycle(self) -> int:
+        """Process events not yet in the database; returns how many were new."""
         now = int(time.time())
-        # Look back 1 hour to catch any events we might have missed
-        start = now - 3600
+        # Resume just behind the newest event seen, but never look back more than an hour
+        start = int(max(self._since, now - LOOKBACK_SECONDS))
         events = self.api.get_events(start_timestamp=start, end_timestamp=now)
+        if events:
+            newest = max(e.timestamp for e in events)
+            self._since = max(self._since, newest - EVENT_OVERLAP_SECONDS)
+
+        known = self.db.get_trace_ids(since=start)
+        new_events = [e for e in events if e.trace_id not in known]
+        if not new_events:
+            return 0
+
+        # Fetch every new keyshot side by side, then store all sightings (for dedup)
+        # with a single INSERT and commit
+        image_paths = await asyncio.gather(*(
+            asyncio.to_thread(download_image, e.keyshot_url, e.trace_id) for e in new_events
+        ))
+        sighting_ids = self.db.insert_sightings_many([
+            (e.trace_id, e.timestamp, e.device_name, str(p) if p else None)
+            for e, p in zip(new_events, image_paths)
+        ])
+
+        # Events are finalized one at a time so lifer checks see earlier events in the cycle
+        for event, sighting_id, image_path in zip(new_events, sighting_ids, image_paths):
+            if sighting_id is None:
+                continue  # Stored by another process (e.g. backfill) since the dedup check
+            try:
+                await self._process_event(event, sighting_id, image_path)
+            except Exception:
+                logger.exception("Failed to process event %s", event.trace_id)
 
-        new_count = 0
-        for event in events:
-            if self.db.has_trace_id(event.trace_id):
-                continue
-            new_count += 1
-            await self._process_event(event)
-
-        if new_count:
-            logger.info("Processed %d new events", new_count)
+        logger.info("Processed %d new events", len(new_events))
+        return len(new_events)
 
-    async def _process_event(self, event: MotionEvent) -> None:
+    async def _process_event(
+        self, event: MotionEvent, sighting_id: str, image_path: Path | None
+    ) -> None:
         logger.info("Processing event %s from %s", event.trace_id, event.device_name)
 
-        # Step 1: Download keyshot image
-        image_path = download_image(event.keyshot_url, event.trace_id)
-
-        # Step 2: Store initial sighting (for dedup)
-        sighting_id = self.db.insert_sighting(
-            trace_id=event.trace_id,
-            timestamp=event.timestamp,
-            device_name=event.device_name,
-            image_path=str(image_path) if image_path else None,
+        # Step 1: Vision analysis on keyshot (primary species source) and the
+        # archive video download are independent remote calls; run them together
+        vision, video_path = await asyncio.gather(
+            analyze_image(image_path, sighting_id, self.db) if image_path else _none(),
+            download_video(event.video_url, event.trace_id),
         )
 
-        # Step 3: Vision analysis on keyshot (primary species source)
         species = None
         species_latin = None
         confidence = None
         is_lifer = False
 
-        if image_path:
-            vision = await analyze_image(image_path, sighting_id, self.db)
-            if vision and vision.is_bird and vision.species:
-                species = vision.species
-                species_latin = vision.species_latin
-                confidence_map = {"high": 0.9, "medium": 0.7, "low": 0.4}
-                confidence = confidence_map.get(vision.confidence or "", 0.5)
-                is_lifer = self.db.is_lifer(species)
-
-        # Step 4: Download video for archive
-        video_path = await download_video(event.video_url, event.trace_id)
-        if video_path:
-            self.db.update_media_paths(sighting_id, video_path=str(video_path))
-
-        # Step 5: Check VicoHome's own bird ID as fallback
+        if vision and vision.is_bird and vision.species:
+            species = vision.species
+            species_latin = vision.species_latin
+            confidence_map = {"high": 0.9, "medium": 0.7, "low": 0.4}
+            confidence = confidence_map.get(vision.confidence or "", 0.5)
+            is_lifer = self.db.is_lifer(species)
+
+        # Step 2: Check VicoHome's own bird ID as fallback
         if not species and event.bird_name:
             species = event.bird_name
             species_latin = event.bird_latin
@@ -112,10 +141,13 @@ class Pipeline:
             logger.info("Using VicoHome ID: %s (%.0f%%)", species,
                         (confidence or 0) * 100)
 
-        # Step 6: Update DB with species info
-        self.db.update_species(sighting_id, species, species_latin, confidence, is_lifer)
+        # Step 3: Store species info and video path in one UPDATE
+        self.db.finalize_sighting(
+            sighting_id, species, species_latin, confidence, is_lifer,
+            video_path=str(video_path) if video_path else None,
+        )
 
-        # Step 7: Notify only on new lifers
+        # Step 4: Notify only on new lifers
         if is_lifer:
             logger.info("NEW LIFER: %s", species)
             await self.bot.send_lifer_alert(species, confidence, image_path, video_path)
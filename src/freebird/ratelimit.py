@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+
+class AsyncLimiter:
+    """Token bucket allowing ``rate`` acquisitions per ``period`` seconds.
+
+    Bursts up to ``burst`` (default ``rate``) go through immediately; after that
+    callers wait for tokens to refill. ``burst=1`` spaces every acquisition
+    ``period / rate`` apart, so no window of ``period`` seconds exceeds ``rate``.
+    Use as ``async with limiter: ...``.
+    """
+
+    def __init__(self, rate: float, period: float = 1.0, burst: float | None = None) -> None:
+        self.rate = rate
+        self.period = period
+        self.burst = float(rate if burst is None else burst)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.burst,
+                    self._tokens + (now - self._updated) * self.rate / self.period,
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) * self.period / self.rate)
+
+    async def __aenter__(self) -> None:
+        await self.acquire()
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        return None
@@ -1,18 +1,42 @@
 from __future__ import annotations
 
 import logging
+import os
 import sqlite3
-import uuid
-from dataclasses import dataclass
+import threading
+import time
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass, fields
 from datetime import datetime, timezone
 
 from freebird.config import DB_PATH, local_today
 
 logger = logging.getLogger(__name__)
 
-SCHEMA = """\
-CREATE TABLE IF NOT EXISTS sightings (
-    id TEXT PRIMARY KEY,
+# get_recent_summary results are reused for this long unless species data changes
+SUMMARY_CACHE_TTL = 60
+STATEMENT_CACHE_SIZE = 256
+# Stay well under SQLite's bound-variable limit (999 on older builds)
+SQL_IN_CHUNK = 500
+# How often the background checkpointer folds the WAL back into the database file
+WAL_CHECKPOINT_SECONDS = 30
+
+# WAL lets readers (bot, eval tools) run while the pipeline writes; NORMAL sync is
+# durable under WAL except for the last commits on power loss
+PRAGMAS = """\
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+PRAGMA temp_store=MEMORY;
+PRAGMA cache_size=-65536;
+PRAGMA mmap_size=268435456;
+PRAGMA busy_timeout=60000;
+"""
+
+# seq is last so the leading columns of SELECT * stay in Sighting field order
+SIGHTINGS_TABLE = """\
+CREATE TABLE IF NOT EXISTS {name} (
+    id TEXT UNIQUE NOT NULL,
     trace_id TEXT UNIQUE NOT NULL,
     species TEXT,
     species_latin TEXT,
@@ -23,12 +47,95 @@ CREATE TABLE IF NOT EXISTS sightings (
     image_path TEXT,
     audio_path TEXT,
     is_lifer INTEGER DEFAULT 0,
-    created_at TEXT DEFAULT (datetime('now'))
+    created_at TEXT DEFAULT (datetime('now')),
+    -- Stable integer key for sightings_fts; an implicit rowid can be renumbered by VACUUM
+    seq INTEGER PRIMARY KEY
 );
+"""
 
+SCHEMA = SIGHTINGS_TABLE.format(name="sightings") + """
 CREATE INDEX IF NOT EXISTS idx_sightings_species ON sightings(species);
 CREATE INDEX IF NOT EXISTS idx_sightings_timestamp ON sightings(timestamp);
 CREATE INDEX IF NOT EXISTS idx_sightings_trace_id ON sightings(trace_id);
+CREATE INDEX IF NOT EXISTS idx_sightings_image_ts ON sightings(timestamp)
+    WHERE image_path IS NOT NULL;
+-- Lifers are a handful of rows; this keeps them pre-sorted by time
+CREATE INDEX IF NOT EXISTS idx_sightings_lifer_ts ON sightings(timestamp)
+    WHERE is_lifer = 1;
+-- Covering index for recent per-species counts. Queries name it with INDEXED BY:
+-- left alone, the planner walks idx_sightings_species to avoid a GROUP BY sort and
+-- reads the whole history instead of the recent range
+CREATE INDEX IF NOT EXISTS idx_sightings_ts_species ON sightings(timestamp, species)
+    WHERE species IS NOT NULL;
+
+-- Trigram full-text index over species names, kept in sync by the triggers below.
+-- Trigrams match any substring (like LIKE '%q%') without scanning every sighting
+CREATE VIRTUAL TABLE IF NOT EXISTS sightings_fts USING fts5(
+    species, species_latin, content='sightings', content_rowid='seq', tokenize='trigram'
+);
+
+CREATE TRIGGER IF NOT EXISTS sightings_fts_ai AFTER INSERT ON sightings BEGIN
+    INSERT INTO sightings_fts (rowid, species, species_latin)
+    VALUES (new.seq, new.species, new.species_latin);
+END;
+
+CREATE TRIGGER IF NOT EXISTS sightings_fts_ad AFTER DELETE ON sightings BEGIN
+    INSERT INTO sightings_fts (sightings_fts, rowid, species, species_latin)
+    VALUES ('delete', old.seq, old.species, old.species_latin);
+END;
+
+CREATE TRIGGER IF NOT EXISTS sightings_fts_au AFTER UPDATE OF species, species_latin ON sightings
+BEGIN
+    INSERT INTO sightings_fts (sightings_fts, rowid, species, species_latin)
+    VALUES ('delete', old.seq, old.species, old.species_latin);
+    INSERT INTO sightings_fts (rowid, species, species_latin)
+    VALUES (new.seq, new.species, new.species_latin);
+END;
+
+-- Per-day species counts (UTC days), kept in sync by the triggers below so summaries
+-- don't re-aggregate the whole sightings table. A species change moves the row's
+-- count from the old species to the new one; last_seen is recomputed on removal
+CREATE TABLE IF NOT EXISTS species_daily (
+    day TEXT NOT NULL,
+    species TEXT NOT NULL,
+    cnt INTEGER NOT NULL,
+    last_seen TEXT NOT NULL,
+    PRIMARY KEY (day, species)
+);
+
+CREATE TRIGGER IF NOT EXISTS species_daily_ai AFTER INSERT ON sightings
+WHEN new.species IS NOT NULL BEGIN
+    INSERT INTO species_daily (day, species, cnt, last_seen)
+    VALUES (date(new.timestamp), new.species, 1, new.timestamp)
+    ON CONFLICT (day, species) DO UPDATE
+    SET cnt = cnt + 1, last_seen = max(last_seen, excluded.last_seen);
+END;
+
+CREATE TRIGGER IF NOT EXISTS species_daily_ad AFTER DELETE ON sightings
+WHEN old.species IS NOT NULL BEGIN
+    UPDATE species_daily SET cnt = cnt - 1,
+        last_seen = coalesce((SELECT MAX(timestamp) FROM sightings
+                              WHERE species = old.species
+                                AND date(timestamp) = date(old.timestamp)), last_seen)
+    WHERE day = date(old.timestamp) AND species = old.species;
+    DELETE FROM species_daily
+    WHERE day = date(old.timestamp) AND species = old.species AND cnt <= 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS species_daily_au AFTER UPDATE OF species, timestamp ON sightings
+BEGIN
+    UPDATE species_daily SET cnt = cnt - 1,
+        last_seen = coalesce((SELECT MAX(timestamp) FROM sightings
+                              WHERE species = old.species
+                                AND date(timestamp) = date(old.timestamp)), last_seen)
+    WHERE day = date(old.timestamp) AND species = old.species;
+    DELETE FROM species_daily
+    WHERE day = date(old.timestamp) AND species = old.species AND cnt <= 0;
+    INSERT INTO species_daily (day, species, cnt, last_seen)
+    SELECT date(new.timestamp), new.species, 1, new.timestamp WHERE new.species IS NOT NULL
+    ON CONFLICT (day, species) DO UPDATE
+    SET cnt = cnt + 1, last_seen = max(last_seen, excluded.last_seen);
+END;
 
 CREATE TABLE IF NOT EXISTS vision_analyses (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -61,8 +168,41 @@ CREATE TABLE IF NOT EXISTS conversations (
     error TEXT,
     created_at TEXT DEFAULT (datetime('now'))
 );
+
+-- Mirror of eval/ground_truth.json, kept so the labeler can anti-join in SQL
+CREATE TABLE IF NOT EXISTS ground_truth (
+    id TEXT PRIMARY KEY,
+    label TEXT NOT NULL,
+    is_bird INTEGER NOT NULL,
+    notes TEXT
+);
 """
 
+# Check-and-insert in one statement: an existing trace_id returns no row
+INSERT_SIGHTING_SQL = """\
+INSERT OR IGNORE INTO sightings (id, trace_id, timestamp, device_name, image_path)
+VALUES (?, ?, ?, ?, ?)
+RETURNING id"""
+
+# Sightings columns in Sighting field order, for positional row decoding
+SIGHTING_COLUMNS = (
+    "id, trace_id, species, species_latin, confidence, timestamp, device_name, "
+    "video_path, image_path, audio_path, is_lifer, created_at"
+)
+
+
+def _species_match(query: str, prefix: str = "") -> tuple[str, tuple[str, ...]]:
+    """WHERE clause (and params) matching query anywhere in species or species_latin.
+
+    Uses the trigram FTS index; queries shorter than a trigram fall back to LIKE.
+    """
+    if len(query) >= 3:
+        phrase = '"' + query.replace('"', '""') + '"'
+        return (f"{prefix}seq IN (SELECT rowid FROM sightings_fts WHERE sightings_fts MATCH ?)",
+                (phrase,))
+    pattern = f"%{query}%"
+    return f"({prefix}species LIKE ? OR {prefix}species_latin LIKE ?)", (pattern, pattern)
+
 
 @dataclass
 class Sighting:
@@ -81,29 +221,146 @@ class Sighting:
 
 
 class Database:
-    def __init__(self) -> None:
+    def __init__(self, read_only: bool = False, background_checkpoint: bool = False) -> None:
         DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-        self.conn = sqlite3.connect(str(DB_PATH))
+        self.conn = sqlite3.connect(str(DB_PATH), cached_statements=STATEMENT_CACHE_SIZE)
         self.conn.row_factory = sqlite3.Row
-        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(PRAGMAS)
+        columns = {r["name"] for r in self.conn.execute("PRAGMA table_info(sightings)")}
+        if columns and "seq" not in columns:
+            self._add_sightings_seq()
+        existing = {r[0] for r in self.conn.execute(
+            "SELECT name FROM sqlite_master WHERE name IN ('sightings_fts', 'species_daily')"
+        )}
         self.conn.executescript(SCHEMA)
+        if "sightings_fts" not in existing:
+            # Index sightings recorded before the FTS table existed
+            self.conn.execute("INSERT INTO sightings_fts (sightings_fts) VALUES ('rebuild')")
+            self.conn.commit()
+        if "species_daily" not in existing:
+            # Roll up sightings recorded before the species_daily table existed
+            self.conn.execute(
+                """INSERT INTO species_daily (day, species, cnt, last_seen)
+                   SELECT date(timestamp), species, COUNT(*), MAX(timestamp)
+                   FROM sightings WHERE species IS NOT NULL
+                   GROUP BY date(timestamp), species"""
+            )
+            self.conn.commit()
+        self.read_only = read_only
+        if read_only:
+            self.conn.execute("PRAGMA query_only=ON")
+        self._in_txn = False
+        self._summary_cache: dict[int, tuple[float, str]] = {}
+        self._seen_species: set[str] = set()
+        # Bumped on every species write so callers can invalidate derived caches
+        self.species_version = 0
+        self._checkpoint_stop: threading.Event | None = None
+        if background_checkpoint:
+            # Commits never run a WAL checkpoint (and its fsyncs) inline; a helper
+            # thread with its own connection does it instead
+            self.conn.execute("PRAGMA wal_autocheckpoint=0")
+            self._checkpoint_stop = threading.Event()
+            threading.Thread(
+                target=self._checkpoint_loop, name="sqlite-checkpoint", daemon=True
+            ).start()
+
+    def _checkpoint_loop(self) -> None:
+        conn = sqlite3.connect(str(DB_PATH))
+        try:
+            while not self._checkpoint_stop.wait(WAL_CHECKPOINT_SECONDS):
+                try:
+                    # PASSIVE never waits on readers or writers; it copies what it can
+                    conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+                except sqlite3.Error:
+                    logger.exception("Background WAL checkpoint failed")
+        finally:
+            conn.close()
+
+    def _add_sightings_seq(self) -> None:
+        """Rebuild a pre-seq sightings table so the FTS index has a stable key.
+
+        Dropping the old table also drops its indexes and triggers; SCHEMA recreates
+        them, and the FTS index is rebuilt because sightings_fts is dropped too.
+        """
+        logger.info("Migrating sightings table to add the seq key")
+        columns = ", ".join(f.name for f in fields(Sighting))
+        self.conn.executescript(
+            "BEGIN;\n"
+            "DROP TABLE IF EXISTS sightings_fts;\n"
+            + SIGHTINGS_TABLE.format(name="sightings_new")
+            + f"INSERT INTO sightings_new ({columns}) SELECT {columns} FROM sightings ORDER BY rowid;\n"
+            "DROP TABLE sightings;\n"
+            "ALTER TABLE sightings_new RENAME TO sightings;\n"
+            "COMMIT;"
+        )
+
+    def optimize(self) -> None:
+        """Let SQLite refresh planner statistics (e.g. for new indexes) if they are stale."""
+        # PRAGMA optimize may write sqlite_stat1, which query_only connections refuse
+        if not self.read_only:
+            self.conn.execute("PRAGMA optimize")
 
     def close(self) -> None:
+        if self._checkpoint_stop:
+            self._checkpoint_stop.set()
+        self.optimize()
         self.conn.close()
 
-    def has_trace_id(self, trace_id: str) -> bool:
-        row = self.conn.execute(
-            "SELECT 1 FROM sightings WHERE trace_id = ?", (trace_id,)
-        ).fetchone()
-        return row is not None
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Group writes into a single commit. Nested use joins the outer transaction."""
+        if self._in_txn:
+            yield
+            return
+        self._in_txn = True
+        try:
+            yield
+        except BaseException:
+            self.conn.rollback()
+            raise
+        else:
+            self.conn.commit()
+        finally:
+            self._in_txn = False
+
+    def _commit(self) -> None:
+        if not self._in_txn:
+            self.conn.commit()
+
+    def get_trace_ids(self, since: float) -> set[str]:
+        """All trace ids for sightings at or after a UNIX timestamp, in one query."""
+        since_str = datetime.fromtimestamp(since, tz=timezone.utc).isoformat()
+        rows = self.conn.execute(
+            "SELECT trace_id FROM sightings WHERE timestamp >= ?", (since_str,)
+        ).fetchall()
+        return {r["trace_id"] for r in rows}
+
+    def get_image_paths(self, sighting_ids: list[str]) -> dict[str, str | None]:
+        """Map sighting id -> image_path using IN queries of at most SQL_IN_CHUNK ids."""
+        paths: dict[str, str | None] = {}
+        for i in range(0, len(sighting_ids), SQL_IN_CHUNK):
+            chunk = sighting_ids[i:i + SQL_IN_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self.conn.execute(
+                f"SELECT id, image_path FROM sightings WHERE id IN ({placeholders})", chunk
+            ).fetchall()
+            paths.update((r["id"], r["image_path"]) for r in rows)
+        return paths
 
     def is_lifer(self, species: str) -> bool:
         if not species:
             return False
+        # Only "seen" answers are cached: they stay true, while a miss must be
+        # rechecked in case another process recorded the species since
+        if species in self._seen_species:
+            return False
         row = self.conn.execute(
             "SELECT 1 FROM sightings WHERE species = ? LIMIT 1", (species,)
         ).fetchone()
-        return row is None
+        if row is None:
+            return True
+        self._seen_species.add(species)
+        return False
 
     def insert_sighting(
         self,
@@ -111,16 +368,34 @@ class Database:
         timestamp: float,
         device_name: str = "",
         image_path: str | None = None,
-    ) -> str:
-        sighting_id = uuid.uuid4().hex[:16]
+    ) -> str | None:
+        """Insert a sighting, or return None if its trace_id is already stored."""
         ts_str = datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat()
-        self.conn.execute(
-            """INSERT INTO sightings (id, trace_id, timestamp, device_name, image_path)
-               VALUES (?, ?, ?, ?, ?)""",
-            (sighting_id, trace_id, ts_str, device_name, image_path),
-        )
-        self.conn.commit()
-        return sighting_id
+        row = self.conn.execute(
+            INSERT_SIGHTING_SQL,
+            (os.urandom(8).hex(), trace_id, ts_str, device_name, image_path),
+        ).fetchone()
+        self._commit()
+        return row[0] if row else None
+
+    def insert_sightings_many(
+        self, rows: list[tuple[str, float, str, str | None]],
+    ) -> list[str | None]:
+        """Insert (trace_id, timestamp, device_name, image_path) rows with one commit.
+
+        Returns the new sighting ids in input order, with None for trace_ids that were
+        already stored (e.g. by another process since the caller's dedup check).
+        """
+        ids = []
+        for trace_id, timestamp, device_name, image_path in rows:
+            ts_str = datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat()
+            row = self.conn.execute(
+                INSERT_SIGHTING_SQL,
+                (os.urandom(8).hex(), trace_id, ts_str, device_name, image_path),
+            ).fetchone()
+            ids.append(row[0] if row else None)
+        self._commit()
+        return ids
 
     def update_species(
         self,
@@ -136,60 +411,67 @@ class Database:
                WHERE id = ?""",
             (species, species_latin, confidence, int(is_lifer), sighting_id),
         )
-        self.conn.commit()
+        self._commit()
+        if species:
+            self._seen_species.add(species)
+        self._species_changed()
 
-    def update_media_paths(
+    def finalize_sighting(
         self,
         sighting_id: str,
+        species: str | None,
+        species_latin: str | None,
+        confidence: float | None,
+        is_lifer: bool,
         video_path: str | None = None,
         audio_path: str | None = None,
-        image_path: str | None = None,
     ) -> None:
-        updates = []
-        params: list = []
-        if video_path is not None:
-            updates.append("video_path = ?")
-            params.append(video_path)
-        if audio_path is not None:
-            updates.append("audio_path = ?")
-            params.append(audio_path)
-        if image_path is not None:
-            updates.append("image_path = ?")
-            params.append(image_path)
-        if not updates:
-            return
-        params.append(sighting_id)
+        """Set species and media paths in one UPDATE (None paths are left as-is)."""
         self.conn.execute(
-            f"UPDATE sightings SET {', '.join(updates)} WHERE id = ?", params
+            """UPDATE sightings
+               SET species = ?, species_latin = ?, confidence = ?, is_lifer = ?,
+                   video_path = COALESCE(?, video_path),
+                   audio_path = COALESCE(?, audio_path)
+               WHERE id = ?""",
+            (species, species_latin, confidence, int(is_lifer),
+             video_path, audio_path, sighting_id),
         )
-        self.conn.commit()
+        self._commit()
+        if species:
+            self._seen_species.add(species)
+        self._species_changed()
 
     def get_today_sightings(self) -> list[Sighting]:
+        today = local_today()
+        return self._fetch_sightings(
+            f"""SELECT {SIGHTING_COLUMNS} FROM sightings
+                WHERE timestamp >= ? AND species IS NOT NULL
+                ORDER BY timestamp DESC""",
+            (today,),
+        )
+
+    def get_today_species_counts(self) -> list[tuple[str, int]]:
+        """Today's visits per species, most visited first."""
         today = local_today()
         rows = self.conn.execute(
-            """SELECT * FROM sightings
+            """SELECT species, COUNT(*) FROM sightings INDEXED BY idx_sightings_ts_species
                WHERE timestamp >= ? AND species IS NOT NULL
-               ORDER BY timestamp DESC""",
+               GROUP BY species
+               ORDER BY COUNT(*) DESC, MAX(timestamp) DESC""",
             (today,),
         ).fetchall()
-        return [self._row_to_sighting(r) for r in rows]
+        return [(r[0], r[1]) for r in rows]
 
     def get_stats(self) -> dict:
-        total = self.conn.execute("SELECT COUNT(*) FROM sightings").fetchone()[0]
-        with_species = self.conn.execute(
-            "SELECT COUNT(*) FROM sightings WHERE species IS NOT NULL"
-        ).fetchone()[0]
-        unique = self.conn.execute(
-            "SELECT COUNT(DISTINCT species) FROM sightings WHERE species IS NOT NULL"
-        ).fetchone()[0]
+        total, with_species, unique, lifers = self.conn.execute(
+            """SELECT COUNT(*), COUNT(species), COUNT(DISTINCT species),
+                      COALESCE(SUM(is_lifer = 1), 0)
+               FROM sightings"""
+        ).fetchone()
         top = self.conn.execute(
-            """SELECT species, COUNT(*) as cnt FROM sightings
-               WHERE species IS NOT NULL
+            """SELECT species, SUM(cnt) as cnt FROM species_daily
                GROUP BY species ORDER BY cnt DESC LIMIT 5"""
         ).fetchall()
-        lifers = self.conn.execute(
-            "SELECT COUNT(*) FROM sightings WHERE is_lifer = 1"
-        ).fetchone()[0]
         critters = self.conn.execute(
             """SELECT animal_type, COUNT(*) as cnt FROM vision_analyses
                WHERE is_bird = 0 AND animal_type IS NOT NULL
@@ -205,20 +487,58 @@ class Database:
         }
 
     def get_lifers(self) -> list[Sighting]:
-        rows = self.conn.execute(
-            """SELECT * FROM sightings WHERE is_lifer = 1
-               ORDER BY timestamp ASC"""
-        ).fetchall()
-        return [self._row_to_sighting(r) for r in rows]
+        return self._fetch_sightings(
+            f"""SELECT {SIGHTING_COLUMNS} FROM sightings WHERE is_lifer = 1
+                ORDER BY timestamp ASC"""
+        )
 
     def search_species(self, query: str) -> list[Sighting]:
-        rows = self.conn.execute(
-            """SELECT * FROM sightings
-               WHERE species LIKE ? OR species_latin LIKE ?
-               ORDER BY timestamp DESC LIMIT 20""",
-            (f"%{query}%", f"%{query}%"),
-        ).fetchall()
-        return [self._row_to_sighting(r) for r in rows]
+        match, params = _species_match(query)
+        return self._fetch_sightings(
+            f"""SELECT {SIGHTING_COLUMNS} FROM sightings
+                WHERE {match}
+                ORDER BY timestamp DESC LIMIT 20""",
+            params,
+        )
+
+    def search_species_summary(
+        self, query: str, exact: bool = False
+    ) -> tuple[Sighting, int] | None:
+        """Latest sighting matching query and the total number of matches.
+
+        exact=True matches the full common name via idx_sightings_species instead
+        of searching for a substring.
+        """
+        match, params = ("species = ?", (query,)) if exact else _species_match(query)
+        row = self.conn.execute(
+            f"""SELECT {SIGHTING_COLUMNS}, COUNT(*) OVER () AS total FROM sightings
+                WHERE {match}
+                ORDER BY timestamp DESC LIMIT 1""",
+            params,
+        ).fetchone()
+        if not row:
+            return None
+        return self._row_to_sighting(row), row["total"]
+
+    def find_species_with_vision(self, query: str) -> tuple[Sighting, dict | None] | None:
+        """Latest sighting matching query, with behavior/notable from its newest vision row."""
+        match, params = _species_match(query, "s.")
+        # s.* expands in table order, which is SIGHTING_COLUMNS order
+        row = self.conn.execute(
+            f"""SELECT s.*, v.id AS v_id, v.behavior AS v_behavior, v.notable AS v_notable
+                FROM sightings s
+                LEFT JOIN vision_analyses v ON v.id = (
+                    SELECT MAX(id) FROM vision_analyses WHERE sighting_id = s.id)
+                WHERE {match}
+                ORDER BY s.timestamp DESC LIMIT 1""",
+            params,
+        ).fetchone()
+        if not row:
+            return None
+        vision = None
+        if row["v_id"] is not None:
+            vision = {"behavior": row["v_behavior"], "notable": row["v_notable"]}
+        return self._row_to_sighting(row), vision
 
     def search_critters(self, query: str) -> list[dict]:
         """Search vision_analyses for non-bird animals matching query."""
@@ -234,25 +554,26 @@ class Database:
         ).fetchall()
         return [dict(r) for r in rows]
 
-    def get_vision_for_sighting(self, sighting_id: str) -> dict | None:
-        row = self.conn.execute(
-            """SELECT species, animal_type, confidence, count, sex, age,
-                      behavior, notable
-               FROM vision_analyses
-               WHERE sighting_id = ? ORDER BY id DESC LIMIT 1""",
-            (sighting_id,),
-        ).fetchone()
-        return dict(row) if row else None
+    def _species_changed(self) -> None:
+        self._summary_cache.clear()
+        self.species_version += 1
 
     def get_recent_summary(self, days: int = 7) -> str:
+        cached = self._summary_cache.get(days)
+        if cached and time.monotonic() - cached[0] < SUMMARY_CACHE_TTL:
+            return cached[1]
+        summary = self._build_recent_summary(days)
+        self._summary_cache[days] = (time.monotonic(), summary)
+        return summary
+
+    def _build_recent_summary(self, days: int) -> str:
         rows = self.conn.execute(
-            """SELECT species, COUNT(*) as cnt,
-                      MAX(timestamp) as last_seen
-               FROM sightings
-               WHERE species IS NOT NULL
-                 AND timestamp >= datetime('now', ?)
+            """SELECT species, SUM(cnt) as cnt,
+                      MAX(last_seen) as last_seen
+               FROM species_daily
+               WHERE day >= date('now', ?)
                GROUP BY species ORDER BY cnt DESC""",
-            (f"-{days} days",),
+            (f"-{days - 1} days",),
         ).fetchall()
         if not rows:
             return "No bird sightings in the last week."
@@ -288,7 +609,7 @@ class Database:
              animal_type, count, sex, age, behavior, notable,
              raw_response, model, error),
         )
-        self.conn.commit()
+        self._commit()
 
     def log_conversation(
         self,
@@ -305,21 +626,37 @@ class Database:
                VALUES (?, ?, ?, ?, ?, ?)""",
             (user_name, question, context, response, model, error),
         )
-        self.conn.commit()
+        self._commit()
 
-    @staticmethod
-    def _row_to_sighting(row: sqlite3.Row) -> Sighting:
-        return Sighting(
-            id=row["id"],
-            trace_id=row["trace_id"],
-            species=row["species"],
-            species_latin=row["species_latin"],
-            confidence=row["confidence"],
-            timestamp=row["timestamp"],
-            device_name=row["device_name"],
-            video_path=row["video_path"],
-            image_path=row["image_path"],
-            audio_path=row["audio_path"],
-            is_lifer=bool(row["is_lifer"]),
-            created_at=row["created_at"],
+    def replace_ground_truth(self, labels: dict[str, dict]) -> None:
+        """Replace the ground_truth table with the contents of a ground_truth.json dict."""
+        with self.transaction():
+            self.conn.execute("DELETE FROM ground_truth")
+            self.conn.executemany(
+                "INSERT INTO ground_truth (id, label, is_bird, notes) VALUES (?, ?, ?, ?)",
+                [
+                    (sighting_id, label["label"], int(label["is_bird"]), label.get("notes"))
+                    for sighting_id, label in labels.items()
+                ],
+            )
+
+    def upsert_ground_truth(
+        self, sighting_id: str, label: str, is_bird: bool, notes: str | None = None
+    ) -> None:
+        self.conn.execute(
+            """INSERT OR REPLACE INTO ground_truth (id, label, is_bird, notes)
+               VALUES (?, ?, ?, ?)""",
+            (sighting_id, label, int(is_bird), notes),
         )
+        self._commit()
+
+    def _fetch_sightings(self, sql: str, params: tuple = ()) -> list[Sighting]:
+        """Run a SELECT of SIGHTING_COLUMNS, reading plain tuples instead of Rows."""
+        cur = self.conn.cursor()
+        cur.row_factory = None
+        return [self._row_to_sighting(r) for r in cur.execute(sql, params)]
+
+    @staticmethod
+    def _row_to_sighting(row: Sequence) -> Sighting:
+        """Build a Sighting from a row whose first columns are SIGHTING_COLUMNS."""
+        return Sighting(*row[:10], bool(row[10]), row[11])
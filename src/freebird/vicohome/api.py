@@ -4,7 +4,8 @@ import logging
 import time
 from typing import Any
 
-import requests
+from pydantic import TypeAdapter, ValidationError
+from pydantic_core import from_json
 
 from freebird.config import get_api_base, get_country_no
 from freebird.vicohome.auth import AuthManager
@@ -12,6 +13,8 @@ from freebird.vicohome.models import MotionEvent
 
 logger = logging.getLogger(__name__)
 
+_EVENTS_ADAPTER = TypeAdapter(list[MotionEvent])
+
 
 class VicoHomeAPI:
     def __init__(self, auth: AuthManager | None = None) -> None:
@@ -24,27 +27,24 @@ class VicoHomeAPI:
 
         for attempt in range(2):
             token = self.auth.get_token()
-            resp = requests.post(
+            resp = self.auth.session.post(
                 url,
                 json=payload,
-                headers={
-                    "Content-Type": "application/json",
-                    "Accept": "application/json",
-                    "Authorization": token,
-                },
+                headers={"Authorization": token},
                 timeout=15,
             )
             resp.raise_for_status()
 
             # Check for HTML error responses (auth redirect)
-            if resp.text.lstrip().startswith("<"):
+            if resp.content.lstrip().startswith(b"<"):
                 if attempt == 0:
                     logger.warning("Got HTML response, refreshing token")
                     self.auth.invalidate()
                     continue
                 raise RuntimeError("VicoHome API returned HTML after token refresh")
 
-            body = resp.json()
+            # pydantic-core's Rust parser; event lists can be large
+            body = from_json(resp.content)
 
             if AuthManager.is_auth_error(body):
                 if attempt == 0:
@@ -84,6 +84,10 @@ class VicoHomeAPI:
             return []
 
         raw_list = body.get("data", {}).get("list", [])
+        try:
+            return _EVENTS_ADAPTER.validate_python(raw_list)
+        except ValidationError:
+            pass  # Fall back to per-item validation to skip only the bad events
         events = []
         for item in raw_list:
             try:
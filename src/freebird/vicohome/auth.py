@@ -2,10 +2,12 @@ from __future__ import annotations
 
 import json
 import logging
+import re
 import time
 from pathlib import Path
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from freebird.config import (
     VICOHOME_EMAIL,
@@ -18,10 +20,17 @@ logger = logging.getLogger(__name__)
 AUTH_ERROR_CODES = {-1024, -1025, -1026, -1027}
 TOKEN_TTL_SECONDS = 23 * 60 * 60  # 23h (conservative vs 24h server-side)
 CACHE_PATH = Path.home() / ".freebird" / "auth.json"
+_AUTH_MSG_RE = re.compile(r"token|auth|login", re.IGNORECASE)
 
 
 class AuthManager:
     def __init__(self) -> None:
+        # Shared with VicoHomeAPI so login and API calls reuse one keep-alive pool
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+        self.session.headers.update(
+            {"Content-Type": "application/json", "Accept": "application/json"}
+        )
         self._token: str | None = None
         self._expires_at: float = 0
         self._load_cached_token()
@@ -39,14 +48,13 @@ class AuthManager:
 
     def _login(self) -> str:
         logger.info("Logging in to VicoHome API")
-        resp = requests.post(
+        resp = self.session.post(
             f"{get_api_base()}/account/login",
             json={
                 "email": VICOHOME_EMAIL,
                 "password": VICOHOME_PASSWORD,
                 "loginType": 0,
             },
-            headers={"Content-Type": "application/json", "Accept": "application/json"},
             timeout=15,
         )
         resp.raise_for_status()
@@ -89,5 +97,6 @@ class AuthManager:
         code = response_body.get("result", response_body.get("code"))
         if isinstance(code, int) and code in AUTH_ERROR_CODES:
             return True
-        msg = str(response_body.get("msg", "")).lower()
-        return any(kw in msg for kw in ("token", "auth", "login"))
+        if code == 0:
+            return False
+        return bool(_AUTH_MSG_RE.search(str(response_body.get("msg", ""))))
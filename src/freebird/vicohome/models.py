@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from functools import cached_property
+
 from pydantic import BaseModel, Field
 
 
@@ -32,26 +34,33 @@ class MotionEvent(BaseModel):
 
     model_config = {"populate_by_name": True}
 
+    @cached_property
+    def bird_info(self) -> tuple[str, str, float]:
+        """(name, latin, confidence) from the bird entries, found in one pass."""
+        name = latin = ""
+        confidence = None
+        for info in self.subcategory_info_list:
+            if info.object_type != "bird":
+                continue
+            if confidence is None:
+                confidence = info.confidence
+            name = name or info.object_name
+            latin = latin or info.bird_std_name
+            if name and latin:
+                break
+        return name, latin, confidence or 0.0
+
     @property
     def bird_name(self) -> str:
-        for info in self.subcategory_info_list:
-            if info.object_type == "bird" and info.object_name:
-                return info.object_name
-        return ""
+        return self.bird_info[0]
 
     @property
     def bird_latin(self) -> str:
-        for info in self.subcategory_info_list:
-            if info.object_type == "bird" and info.bird_std_name:
-                return info.bird_std_name
-        return ""
+        return self.bird_info[1]
 
     @property
     def bird_confidence(self) -> float:
-        for info in self.subcategory_info_list:
-            if info.object_type == "bird":
-                return info.confidence
-        return 0.0
+        return self.bird_info[2]
 
     @property
     def keyshot_url(self) -> str:
@@ -1,4 +1,9 @@
-"""Run Claude Vision analysis on all existing sightings that have keyshot images."""
+"""Run Claude Vision analysis on all existing sightings that have keyshot images.
+
+Pass --batch (anthropic: models only) to submit every image through Message
+Batches (split to fit the per-batch limits) instead of calling the model per image. Otherwise up to VISION_CONCURRENCY
+images are analyzed at once, capped at VISION_RPM requests per minute.
+"""
 from __future__ import annotations
 
 import asyncio
@@ -7,8 +12,16 @@ import sys
 import time
 from pathlib import Path
 
-from freebird.analysis.vision import analyze_image
-from freebird.config import ensure_dirs
+from freebird.analysis.vision import (
+    VisionResult,
+    analyze_image,
+    fetch_vision_batch,
+    store_vision_batch,
+    submit_vision_batches,
+    vision_batch_ended,
+)
+from freebird.config import VISION_MODEL, VISION_RPM, ensure_dirs
+from freebird.ratelimit import AsyncLimiter
 from freebird.storage.database import Database
 
 logging.basicConfig(
@@ -18,9 +31,91 @@ logging.basicConfig(
 )
 logger = logging.getLogger("freebird.vision_backfill")
 
+BATCH_POLL_SECONDS = 30
+VISION_CONCURRENCY = 4
+
+
+def _apply_vision(db: Database, sighting_id: str, vision: VisionResult | None) -> tuple[bool, bool]:
+    """Copy a vision result onto its sighting. Returns (had_animal, species_updated)."""
+    if vision and vision.is_bird and vision.species:
+        confidence_map = {"high": 0.9, "medium": 0.7, "low": 0.4}
+        confidence = confidence_map.get(vision.confidence or "", 0.5)
+        is_lifer = db.is_lifer(vision.species)
+        db.update_species(
+            sighting_id, vision.species, vision.species_latin,
+            confidence, is_lifer,
+        )
+        logger.info("  -> %s (%s)%s", vision.species, vision.confidence,
+                    " [LIFER]" if is_lifer else "")
+        return True, True
+    if vision and vision.animal_type:
+        logger.info("  -> %s (not a bird)", vision.animal_type)
+        return True, False
+    logger.info("  -> No animal detected")
+    return False, False
+
+
+async def _run_batch(db: Database, rows: list) -> tuple[int, int]:
+    """Analyze all rows through Anthropic Message Batches (split to fit batch limits)."""
+    batch_ids = await submit_vision_batches(
+        [Path(r["image_path"]) for r in rows],
+        [r["id"] for r in rows],
+    )
+    if not batch_ids:
+        return 0, 0
+    for batch_id in batch_ids:
+        while not await vision_batch_ended(batch_id):
+            await asyncio.sleep(BATCH_POLL_SECONDS)
+
+    # Download everything first so the write transaction never spans network I/O
+    items = [item for batch_id in batch_ids for item in await fetch_vision_batch(batch_id)]
+
+    analyzed = 0
+    updated = 0
+    # Results are already computed, so store them and the species updates with one
+    # commit rather than two per row
+    with db.transaction():
+        results = store_vision_batch(items, db)
+        # Apply in timestamp order so lifer detection matches the sequential path
+        for row in rows:
+            had_animal, species_updated = _apply_vision(db, row["id"], results.get(row["id"]))
+            analyzed += had_animal
+            updated += species_updated
+    return analyzed, updated
+
+
+async def _run_concurrent(db: Database, rows: list) -> tuple[int, int]:
+    """Analyze rows concurrently under the rate limit, applying results in order."""
+    # Burst of 1 spaces requests 60/VISION_RPM apart; a full bucket would let
+    # ~2x VISION_RPM through in the first minute
+    limiter = AsyncLimiter(VISION_RPM, 60, burst=1)
+    sem = asyncio.Semaphore(VISION_CONCURRENCY)
+    total = len(rows)
+
+    async def analyze(i: int, row) -> VisionResult | None:
+        image_path = Path(row["image_path"])
+        async with sem, limiter:
+            logger.info("[%d/%d] Analyzing %s", i, total, image_path.name)
+            return await analyze_image(image_path, row["id"], db)
+
+    tasks = [asyncio.create_task(analyze(i, row)) for i, row in enumerate(rows, 1)]
+    analyzed = 0
+    updated = 0
+    # Await in timestamp order so lifer detection matches a sequential run
+    for row, task in zip(rows, tasks):
+        had_animal, species_updated = _apply_vision(db, row["id"], await task)
+        analyzed += had_animal
+        updated += species_updated
+    return analyzed, updated
+
 
 async def run() -> None:
     rerun = "--rerun" in sys.argv
+    batch = "--batch" in sys.argv
+    if batch and not VISION_MODEL.startswith("anthropic:"):
+        logger.error("--batch requires an anthropic: VISION_MODEL (got %s)", VISION_MODEL)
+        return
+
     ensure_dirs()
     db = Database()
 
@@ -45,36 +140,10 @@ async def run() -> None:
     total = len(rows)
     logger.info("Found %d sightings needing vision analysis", total)
 
-    analyzed = 0
-    updated = 0
-    for i, row in enumerate(rows, 1):
-        sighting_id = row["id"]
-        image_path = Path(row["image_path"])
-
-        logger.info("[%d/%d] Analyzing %s", i, total, image_path.name)
-
-        vision = await analyze_image(image_path, sighting_id, db)
-
-        if vision and vision.is_bird and vision.species:
-            analyzed += 1
-            confidence_map = {"high": 0.9, "medium": 0.7, "low": 0.4}
-            confidence = confidence_map.get(vision.confidence or "", 0.5)
-            is_lifer = db.is_lifer(vision.species)
-            db.update_species(
-                sighting_id, vision.species, vision.species_latin,
-                confidence, is_lifer,
-            )
-            updated += 1
-            logger.info("  -> %s (%s)%s", vision.species, vision.confidence,
-                        " [LIFER]" if is_lifer else "")
-        elif vision and vision.animal_type:
-            analyzed += 1
-            logger.info("  -> %s (not a bird)", vision.animal_type)
-        else:
-            logger.info("  -> No animal detected")
-
-        # Delay for Gemini free tier (10 RPM)
-        await asyncio.sleep(7)
+    if batch:
+        analyzed, updated = await _run_batch(db, rows)
+    else:
+        analyzed, updated = await _run_concurrent(db, rows)
 
     db.close()
     logger.info(
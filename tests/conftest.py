@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+
+# freebird.config reads these at import time; tests never talk to the real services
+for _name in ("VICOHOME_EMAIL", "VICOHOME_PASSWORD", "TELEGRAM_BOT_TOKEN", "TELEGRAM_CHAT_ID"):
+    os.environ.setdefault(_name, "test")
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    from freebird.storage import database
+
+    monkeypatch.setattr(database, "DB_PATH", tmp_path / "birds.db")
+    db = database.Database()
+    yield db
+    db.close()
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import time
+
+DAY = 24 * 3600
+
+
+def _rollup(db) -> list[tuple]:
+    return sorted(tuple(r) for r in db.conn.execute(
+        "SELECT day, species, cnt, last_seen FROM species_daily"
+    ))
+
+
+def _direct(db) -> list[tuple]:
+    return sorted(tuple(r) for r in db.conn.execute(
+        """SELECT date(timestamp), species, COUNT(*), MAX(timestamp) FROM sightings
+           WHERE species IS NOT NULL GROUP BY date(timestamp), species"""
+    ))
+
+
+def test_species_daily_tracks_inserts_updates_and_deletes(db):
+    now = time.time()
+    ids = db.insert_sightings_many([
+        (f"trace-{i}", now - (i % 3) * DAY - i * 60, "feeder", None) for i in range(12)
+    ])
+    for i, sighting_id in enumerate(ids):
+        db.update_species(sighting_id, ("Blue Jay", "Robin")[i % 2], None, 0.9, False)
+    assert _rollup(db) == _direct(db)
+
+    # Reassign one sighting, clear another, and delete a third
+    db.update_species(ids[0], "Northern Cardinal", None, 0.8, True)
+    db.update_species(ids[1], None, None, None, False)
+    db.conn.execute("DELETE FROM sightings WHERE id = ?", (ids[2],))
+    db.conn.commit()
+    assert _rollup(db) == _direct(db)
+
+    # A day's row disappears once its last sighting of that species is gone
+    db.conn.execute("UPDATE sightings SET species = NULL")
+    db.conn.commit()
+    assert _rollup(db) == []
+
+
+def test_species_daily_backfills_existing_sightings(db):
+    from freebird.storage import database
+
+    sighting_id = db.insert_sighting("trace-1", time.time(), "feeder")
+    db.update_species(sighting_id, "Blue Jay", None, 0.9, False)
+    db.conn.execute("DROP TABLE species_daily")
+    db.conn.commit()
+
+    reopened = database.Database()
+    try:
+        assert _rollup(reopened) == _direct(reopened)
+        assert "Blue Jay: 1 visits" in reopened.get_recent_summary()
+    finally:
+        reopened.close()
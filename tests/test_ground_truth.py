@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from freebird import ground_truth
+from freebird.ground_truth import append_label, checkpoint, load_ground_truth
+
+BIRD = {"label": "Blue Jay", "is_bird": True}
+SQUIRREL = {"label": "squirrel", "is_bird": False}
+
+
+@pytest.fixture(autouse=True)
+def eval_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(ground_truth, "GROUND_TRUTH_PATH", tmp_path / "ground_truth.json")
+    monkeypatch.setattr(ground_truth, "GROUND_TRUTH_LOG", tmp_path / "ground_truth.log.jsonl")
+    return tmp_path
+
+
+def test_log_is_replayed_over_checkpoint():
+    append_label("a", BIRD)
+    checkpoint(load_ground_truth())
+    assert not ground_truth.GROUND_TRUTH_LOG.exists()
+    assert json.loads(ground_truth.GROUND_TRUTH_PATH.read_text()) == {"a": BIRD}
+
+    append_label("b", SQUIRREL)
+    assert load_ground_truth() == {"a": BIRD, "b": SQUIRREL}
+
+
+def test_last_label_for_a_sighting_wins():
+    append_label("a", BIRD)
+    checkpoint(load_ground_truth())
+    append_label("a", SQUIRREL)
+    append_label("b", BIRD)
+    append_label("b", SQUIRREL)
+    assert load_ground_truth() == {"a": SQUIRREL, "b": SQUIRREL}
+
+
+def test_torn_last_line_is_ignored():
+    append_label("a", BIRD)
+    with ground_truth.GROUND_TRUTH_LOG.open("a") as f:
+        f.write('{"id": "b", "label": "Rob')  # Crash mid-append
+    assert load_ground_truth() == {"a": BIRD}